@@ -406,8 +406,7 @@ def index():
     # ========================================================================
     if ONSHAPE_AVAILABLE:
         user_id = get_current_user_id()
-        client = session_manager.get_client(user_id)
-        if not client:
+        if not session_manager.has_session(user_id):
             # No Onshape session - redirect to OAuth
             log("⛔ Access denied: No Onshape authentication, redirecting to /onshape/auth")
             return redirect('/onshape/auth')
@@ -1094,7 +1093,7 @@ def onshape_oauth_callback():
                 session['using_default_config'] = False
             else:
                 log("⚠️  No team config found - using defaults")
-                team_config = TeamConfig()
+                team_config = TeamConfig.default()
                 session['team_config_data'] = {}
                 session['team_config'] = team_config.to_dict()
                 session['team_number'] = team_config.team_number
@@ -1420,7 +1419,7 @@ def onshape_import():
             session['using_default_config'] = False
         else:
             log("⚠️  No team config found - using defaults")
-            team_config = TeamConfig()
+            team_config = TeamConfig.default()
             session['team_config_data'] = {}
             session['team_config'] = team_config.to_dict()
             session['team_number'] = team_config.team_number
@@ -16,12 +16,16 @@ import os
 import re
 from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Tuple, Optional, Dict, Any
 
 # Third-party
 import ezdxf
-from shapely import affinity
-from shapely.geometry import Point, Polygon, LineString, LinearRing, MultiPolygon
+import numpy as np
+import shapely
+from shapely import affinity, STRtree
+from shapely.geometry import Point, Polygon, LineString, LinearRing, MultiPolygon, box
 from shapely.ops import unary_union, linemerge
 
 # Local modules
@@ -50,6 +54,509 @@ class PostProcessorResult:
         }
 
 
+# Coordinate word patterns (axis letter + signed decimal), compiled once for
+# the per-line G-code rewriting helpers
+_COORD_RE = {axis: re.compile(rf'{axis}(-?\d+\.?\d*)') for axis in 'XYZI'}
+
+# Comments and address words, for reading G-code back in a single pass per line
+_GCODE_COMMENT_RE = re.compile(r'\(.*?\)|;.*$')
+_GCODE_WORD_RE = re.compile(r'([A-Z])([-\d.]+)')
+
+
+def _gcode_words(line: str) -> Dict[str, str]:
+    """Map each word letter in a comment-free G-code line to its first value"""
+    words = {}
+    for letter, value in _GCODE_WORD_RE.findall(line):
+        if letter not in words:
+            words[letter] = value
+    return words
+
+
+@lru_cache(maxsize=256)
+def _helical_pass_plan(total_depth: float, toolpath_radius: float, target_angle_deg: float) -> Tuple[int, float]:
+    """
+    Pure math behind FRCPostProcessor._calculate_helical_passes().
+
+    Memoized because every hole or pocket of the same size and material asks
+    for the same plan.
+
+    Args:
+        total_depth: Depth from ramp start height down to cut depth
+        toolpath_radius: Radius of the circular toolpath
+        target_angle_deg: Target plunge angle in degrees
+
+    Returns:
+        Tuple of (number_of_passes, depth_per_pass)
+    """
+    # Circumference of one revolution
+    circumference = 2 * math.pi * toolpath_radius
+
+    # For target angle: depth_per_rev = circumference * tan(angle)
+    target_depth_per_rev = circumference * math.tan(math.radians(target_angle_deg))
+
+    # Number of passes needed
+    num_passes = max(1, int(math.ceil(total_depth / target_depth_per_rev)))
+    depth_per_pass = total_depth / num_passes
+
+    return num_passes, depth_per_pass
+
+
+@lru_cache(maxsize=64)
+def _offset_contour(contour_points: Tuple[Tuple[float, float], ...], offset_distance: float):
+    """
+    Buffer a contour polygon by a signed offset distance.
+
+    Memoized because regenerating the same part (e.g. after changing the
+    material in the GUI) offsets the same perimeter and pockets again.
+    Shapely geometries are immutable, so the cached result is safe to share.
+
+    Args:
+        contour_points: Contour vertices as a tuple of (x, y) tuples
+        offset_distance: Buffer distance (positive outward, negative inward)
+
+    Returns:
+        Shapely geometry of the offset contour
+    """
+    return Polygon(contour_points).buffer(offset_distance)
+
+
+def _solve_tour(centers) -> Tuple[List[int], float, int]:
+    """
+    Nearest neighbor + 2-opt kernel behind FRCPostProcessor._optimize_route().
+
+    Works purely on coordinates so the route search carries no item dicts.
+
+    Args:
+        centers: Sequence of (x, y) positions, at least two
+
+    Returns:
+        Tuple of (visit order as indices into centers, total distance, 2-opt iterations)
+    """
+    # Pairwise distances between all items, computed once up front.
+    # Uses the difference form (not |a|^2 + |b|^2 - 2ab) so every entry
+    # matches _distance_2d exactly and tie-breaking is unchanged.
+    points = np.array(centers, dtype=np.float64)
+    xs = points[:, 0]
+    ys = points[:, 1]
+    dx = xs[:, None] - xs[None, :]
+    dy = ys[:, None] - ys[None, :]
+    dist_matrix = np.sqrt(dx * dx + dy * dy)
+    origin_dists = np.sqrt(xs * xs + ys * ys)
+
+    # Phase 1: Nearest Neighbor Algorithm
+    # Start at origin (0, 0) and build route by always going to nearest unvisited item.
+    # The route is held as item indices so both phases can index the matrix.
+    visited = np.zeros(len(points), dtype=bool)
+    tour = []
+    dists = origin_dists  # Distances from the current position (origin to start)
+
+    for _ in range(len(points)):
+        # Find nearest unvisited item (argmin keeps the first of any ties)
+        nearest_idx = int(np.argmin(np.where(visited, np.inf, dists)))
+
+        # Add nearest item to route and mark it visited
+        visited[nearest_idx] = True
+        tour.append(nearest_idx)
+        dists = dist_matrix[nearest_idx]
+
+    # Phase 2: 2-opt Optimization
+    # Try swapping edge pairs to reduce total distance. Distances are plain
+    # list lookups here; nothing is re-measured inside the loops.
+    dist = dist_matrix.tolist()
+    from_origin = origin_dists.tolist()
+    num_items = len(tour)
+    improved = True
+    max_iterations = 100
+    iteration = 0
+
+    while improved and iteration < max_iterations:
+        improved = False
+        iteration += 1
+
+        for i in range(num_items - 1):
+            # Everything that depends only on position i is read once per i.
+            # The point before the segment is the origin when i == 0; it is
+            # never moved by a reversal, so only the item at i needs refreshing.
+            row_before = from_origin if i == 0 else dist[tour[i - 1]]
+            idx_i = tour[i]
+            row_i = dist[idx_i]
+            edge_before_i = row_before[idx_i]
+
+            for j in range(i + 2, num_items):
+                # 2-opt: reverse segment from i to j-1
+                # Changes edges: (i-1)→(i) and (j-1)→(j)
+                # Into edges: (i-1)→(j-1) and (i)→(j)
+                idx_j_minus_1 = tour[j - 1]
+                idx_after = tour[j]  # j < num_items, so there is always a point after
+
+                dist_before = edge_before_i + dist[idx_j_minus_1][idx_after]
+                dist_after = row_before[idx_j_minus_1] + row_i[idx_after]
+
+                # If swap improves distance, do it
+                if dist_after < dist_before:
+                    # Reverse the segment from i to j-1
+                    tour[i:j] = reversed(tour[i:j])
+                    improved = True
+
+                    # A different item now sits at position i
+                    idx_i = tour[i]
+                    row_i = dist[idx_i]
+                    edge_before_i = row_before[idx_i]
+
+    # Calculate total travel distance
+    total_dist = from_origin[tour[0]]
+    for i in range(num_items - 1):
+        total_dist += dist[tour[i]][tour[i + 1]]
+
+    return tour, total_dist, iteration
+
+
+def _tube_operation_passes(tube_height: float, material_thickness: float,
+                           tube_facing_params) -> dict:
+    """
+    Pure math behind FRCPostProcessor._calculate_tube_operation_passes().
+
+    Common calculation for both tube facing and cut-to-length operations.
+    Both use the same depth strategy: cut just over half the tube height,
+    with multiple passes to respect flute length limits.
+
+    Args:
+        tube_height: Height of tube in inches (Z dimension)
+        material_thickness: Wall thickness of the tubing in inches
+        tube_facing_params: TubeFacingParams from the team config
+
+    Returns:
+        Dict with pass calculation results:
+        - total_depth: Total depth to cut
+        - wall_thickness: Wall thickness from material_thickness
+        - num_roughing_passes: Number of roughing passes needed
+        - roughing_depth_per_pass: Depth per roughing pass
+        - num_finishing_passes: Number of finishing passes needed
+        - finishing_depth_per_pass: Depth per finishing pass
+    """
+    # Cutting parameters
+    total_depth = tube_height / 2 + tube_facing_params.depth_margin  # Just over half the tube height
+    wall_thickness = material_thickness  # Wall thickness of box tubing
+
+    # Roughing: respects flute length limit (max per pass from params)
+    # 1" tube (0.505"): 2 passes, 2" tube (1.005"): 4 passes
+    max_roughing_depth = tube_facing_params.max_roughing_depth
+    num_roughing_passes = max(1, int(math.ceil(total_depth / max_roughing_depth)))
+    roughing_depth_per_pass = total_depth / num_roughing_passes
+
+    # Finishing: light stepover allows deeper passes (max per pass from params)
+    # 1" tube (0.505"): 1 pass, 2" tube (1.005"): 2 passes
+    max_finishing_depth = tube_facing_params.max_finishing_depth
+    num_finishing_passes = max(1, int(math.ceil(total_depth / max_finishing_depth)))
+    finishing_depth_per_pass = total_depth / num_finishing_passes
+
+    return {
+        'total_depth': total_depth,
+        'wall_thickness': wall_thickness,
+        'num_roughing_passes': num_roughing_passes,
+        'roughing_depth_per_pass': roughing_depth_per_pass,
+        'num_finishing_passes': num_finishing_passes,
+        'finishing_depth_per_pass': finishing_depth_per_pass
+    }
+
+
+@lru_cache(maxsize=32)
+def _tube_facing_toolpath(tube_width: float, tube_height: float, phase: int,
+                          tool_diameter: float, feed_rate: float,
+                          material_thickness: float, tube_facing_params) -> Tuple[str, ...]:
+    """
+    Generate tube facing toolpath - face the end of box tubing.
+
+    Squares the end of box tubing with one vertical plunge and two
+    horizontal passes (roughing + finishing).
+
+    Memoized because repeat jobs (same tube, tool and material) produce the
+    same lines; callers get a shared tuple and must copy it to modify it.
+
+    Coordinate system (tube lying horizontal, end facing spindle):
+    - X: across tube width (cut direction)
+    - Z: tube height (plunge direction, vertical)
+    - Y: facing depth (material removal from tube end, negative = into tube)
+
+    Phase 1 (first end):
+    - Roughing tool edge at Y=+0.05"
+    - Finishing tool edge at Y=+0.0625"
+
+    Phase 2 (after flip):
+    - Roughing tool edge at Y=-0.0125"
+    - Finishing tool edge at Y=0"
+
+    Args:
+        tube_width: Tube width in inches (X dimension)
+        tube_height: Tube height in inches (Z dimension, typically 1" or 2")
+        phase: 1 for first end (with stepover), 2 for second end (no stepover)
+        tool_diameter: Tool diameter in inches
+        feed_rate: Cutting feed rate
+        material_thickness: Wall thickness of the tubing in inches
+        tube_facing_params: TubeFacingParams from the team config
+
+    Returns:
+        Tuple of G-code lines for the facing operation
+    """
+    gcode = []
+    tool_radius = tool_diameter / 2.0
+
+    # Calculate pass parameters using shared helper
+    passes = _tube_operation_passes(tube_height, material_thickness, tube_facing_params)
+    total_depth = passes['total_depth']
+    wall_thickness = passes['wall_thickness']
+    num_roughing_passes = passes['num_roughing_passes']
+    roughing_depth_per_pass = passes['roughing_depth_per_pass']
+    num_finishing_passes = passes['num_finishing_passes']
+    finishing_depth_per_pass = passes['finishing_depth_per_pass']
+
+    # Tool edge positions for each phase (these are the final face positions)
+    if phase == 1:
+        # Phase 1: Roughing and finishing positions from params
+        roughing_tool_edge = tube_facing_params.roughing_tool_edge_p1
+        finishing_tool_edge = tube_facing_params.finishing_tool_edge_p1
+    else:
+        # Phase 2: Roughing and finishing positions from params
+        roughing_tool_edge = tube_facing_params.roughing_tool_edge_p2
+        finishing_tool_edge = tube_facing_params.finishing_tool_edge_p2
+
+    # Arc clearing parameters (needed to calculate roughing_y offset)
+    arc_advance = tube_facing_params.arc_advance  # How far each arc advances in X
+    arc_radius = tube_facing_params.arc_radius  # Arc radius
+    half_advance = arc_advance / 2
+    j_offset = math.sqrt(arc_radius**2 - half_advance**2)
+
+    # Tool CENTER positions for tube facing:
+    # - Coordinate system: +Y is INTO the tube (toward tube body)
+    # - Kept material (tube body) is at +Y, tube face is at Y≈0
+    # - Tool's +Y edge (toward tube body) defines the face position
+    #
+    # With positive J, G3 (CCW) arc goes through TOP of circle (max Y).
+    # Arc center Y = roughing_y + j_offset
+    # Top of circle Y = center_y + arc_radius = roughing_y + j_offset + arc_radius
+    #
+    # At arc CHORD (start/end): tool center Y = roughing_y
+    # At arc PEAK (top of circle): tool center Y = roughing_y + j_offset + arc_radius
+    #
+    # The PEAK is where the tool cuts deepest into the tube (maximum +Y edge).
+    # Roughing should never exceed roughing_tool_edge, so we set PEAK at that limit.
+    #
+    # For roughing +Y edge at PEAK to equal roughing_tool_edge:
+    #   (roughing_y + j_offset + arc_radius) + tool_radius = roughing_tool_edge
+    #   roughing_y = roughing_tool_edge - tool_radius - j_offset - arc_radius
+    roughing_y = roughing_tool_edge - tool_radius - j_offset - arc_radius
+    finishing_y = finishing_tool_edge - tool_radius
+
+    # X positions (tool edge 0.05" from material edge)
+    clearance = tool_radius + 0.05
+    start_x = tube_width + clearance  # Far side
+    end_x = -clearance  # Near side
+
+    # Z positions
+    z_top = tube_height  # Top of tube
+    z_safe = tube_height + 0.25  # Safe height above tube
+    z_final = z_top - total_depth  # Final depth (just over half height)
+
+    chord_face = roughing_y + tool_radius  # Face position at chord (start/end of arc)
+    gcode.append(f'( Tube facing: {tube_width:.2f}" wide x {tube_height:.2f}" tall )')
+    gcode.append(f'( Tool: {tool_diameter:.3f}" )')
+    gcode.append(f'( Total depth: {total_depth:.3f}" )')
+    gcode.append(f'( Roughing: {num_roughing_passes} passes of {roughing_depth_per_pass:.3f}" each, +Y edge at Y={roughing_tool_edge:.4f}" )')
+    gcode.append(f'( Finishing: {num_finishing_passes} passes of {finishing_depth_per_pass:.3f}" each, +Y edge at Y={finishing_tool_edge:.4f}" )')
+
+    # === ROUGHING PASSES ===
+    arc_feed = feed_rate
+
+    gcode.append('( === ROUGHING PASSES === )')
+    gcode.append(f'( {num_roughing_passes} depth passes with arc clearing )')
+
+    # Calculate wall boundaries for subsequent passes (box tubing is hollow)
+    # Back wall (far side): from start_x to inner edge
+    back_wall_inner_x = tube_width - wall_thickness - clearance
+    # Front wall (near side): from inner edge to end_x
+    front_wall_inner_x = wall_thickness + clearance
+
+    for pass_num in range(num_roughing_passes):
+        z_cut = z_top - (pass_num + 1) * roughing_depth_per_pass
+
+        if pass_num == 0:
+            # First pass: full arc pattern across entire width
+            gcode.append(f'( Roughing pass {pass_num + 1}/{num_roughing_passes} to Z={z_cut:.3f}" - full width )')
+
+            # Position at start
+            gcode.append(f'G0 X{start_x:.4f} Y{roughing_y:.4f}')
+            gcode.append(f'G0 Z{z_safe:.4f}')
+
+            # Plunge to cut depth
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Arc clearing pattern across tube width
+            gcode.append(f'G1 F{arc_feed}')
+            current_x = start_x
+            while current_x > end_x + arc_advance:
+                next_x = current_x - arc_advance
+                gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
+                current_x = next_x
+
+            # Final linear move to end position if needed
+            if current_x > end_x:
+                gcode.append(f'G1 X{end_x:.4f}')
+
+            # Retract after this pass
+            gcode.append(f'G0 Z{z_safe:.4f}')
+        else:
+            # Subsequent passes: cut walls only, rapid across hollow middle
+            gcode.append(f'( Roughing pass {pass_num + 1}/{num_roughing_passes} to Z={z_cut:.3f}" - walls only )')
+
+            # Position at start (back wall)
+            gcode.append(f'G0 X{start_x:.4f} Y{roughing_y:.4f}')
+            gcode.append(f'G0 Z{z_safe:.4f}')
+
+            # Plunge to cut depth
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Arc clearing through back wall only
+            gcode.append(f'G1 F{arc_feed}')
+            current_x = start_x
+            while current_x > back_wall_inner_x + arc_advance:
+                next_x = current_x - arc_advance
+                gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
+                current_x = next_x
+
+            # Finish back wall
+            if current_x > back_wall_inner_x:
+                gcode.append(f'G1 X{back_wall_inner_x:.4f}')
+
+            # Retract, rapid across hollow middle
+            gcode.append(f'G0 Z{z_safe:.4f}')
+            gcode.append(f'G0 X{front_wall_inner_x:.4f}')
+
+            # Plunge inside (material already removed on pass 1)
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Arc clearing through front wall
+            gcode.append(f'G1 F{arc_feed}')
+            current_x = front_wall_inner_x
+            while current_x > end_x + arc_advance:
+                next_x = current_x - arc_advance
+                gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
+                current_x = next_x
+
+            # Final linear move to end position if needed
+            if current_x > end_x:
+                gcode.append(f'G1 X{end_x:.4f}')
+
+            # Retract after this pass
+            gcode.append(f'G0 Z{z_safe:.4f}')
+
+    gcode.append(f'( Roughing complete: {num_roughing_passes} passes )')
+
+    # === FINISHING PASSES ===
+    stepover = finishing_tool_edge - roughing_tool_edge
+    gcode.append('( === FINISHING PASSES === )')
+    gcode.append(f'( {num_finishing_passes} depth passes, stepover {stepover:.4f}" )')
+
+    for pass_num in range(num_finishing_passes):
+        z_cut = z_top - (pass_num + 1) * finishing_depth_per_pass
+
+        if pass_num == 0:
+            # First pass: full cut across entire width
+            gcode.append(f'( Finishing pass {pass_num + 1}/{num_finishing_passes} to Z={z_cut:.3f}" - full width )')
+
+            # Position for finishing
+            gcode.append(f'G0 X{start_x:.4f} Y{finishing_y:.4f}')
+
+            # Plunge to cut depth
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Single horizontal cut across
+            gcode.append(f'G1 X{end_x:.4f} F{feed_rate}')
+
+            # Retract
+            gcode.append(f'G0 Z{z_safe:.4f}')
+        else:
+            # Subsequent passes: cut walls only, rapid across hollow middle
+            gcode.append(f'( Finishing pass {pass_num + 1}/{num_finishing_passes} to Z={z_cut:.3f}" - walls only )')
+
+            # Position at start (back wall)
+            gcode.append(f'G0 X{start_x:.4f} Y{finishing_y:.4f}')
+
+            # Plunge to cut depth
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Cut through back wall only
+            gcode.append(f'G1 X{back_wall_inner_x:.4f} F{feed_rate}')
+
+            # Retract, rapid across hollow middle
+            gcode.append(f'G0 Z{z_safe:.4f}')
+            gcode.append(f'G0 X{front_wall_inner_x:.4f}')
+
+            # Plunge inside (material already removed on pass 1)
+            gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
+
+            # Cut through front wall
+            gcode.append(f'G1 X{end_x:.4f} F{feed_rate}')
+
+            # Retract
+            gcode.append(f'G0 Z{z_safe:.4f}')
+
+    return tuple(gcode)
+
+
+# Static sections of the tube facing program, filled with str.format_map().
+# Each renders to text that is split on newlines into G-code lines; a leading
+# or trailing newline produces the blank separator line.
+_TUBE_FACING_HEADER_TEMPLATE = """\
+( PENGUINCAM TUBE FACING OPERATION )
+( Generated: {timestamp_display} )
+( Tube size: {tube_size} )
+( Tool: {tool_diameter:.3f}" end mill )
+( )
+( SETUP INSTRUCTIONS: )
+( 1. Mount tube in jig with end facing user )
+( 2. Verify G55 is set to jig origin )
+( 3. Z=0 is at bottom of tube [jig surface] )
+( 4. Y=0 is at nominal end face of tube )
+( )
+
+( === INITIALIZATION === )
+G90 G94 G91.1 G40 G49 G17
+G20
+G90  ; Absolute positioning mode
+
+( Tool and spindle )
+T1 M6
+S{spindle_speed} M3
+M7  ; Air blast on
+G4 P3.0
+
+G55  ; Use jig work coordinate system
+
+( === PHASE 1: FACE FIRST HALF === )
+( Face from Y=-0.125 to Y=+0.125 )
+
+G53 G0 Z{park_z:.4f}  ; Move to safe machine Z clearance
+G0 X0 Y0  ; Rapid to work origin
+"""
+
+_TUBE_FACING_PHASE2_TEMPLATE = """\
+( === PHASE 2: FACE SECOND HALF === )
+( Face from Y=-0.250 to Y=-0.125 )
+
+G53 G0 Z{park_z:.4f}  ; Move to safe machine Z clearance
+G0 X0 Y0  ; Rapid to work origin
+"""
+
+_TUBE_FACING_FOOTER_TEMPLATE = """
+( === PROGRAM END === )
+G53 G0 Z{park_z:.4f}  ; Move to safe machine Z clearance
+G53 G0 X{park_x} Y{park_y}  ; Park at back of machine
+M9  ; Air blast off
+M5
+G54  ; Reset to standard work coordinate system
+M30"""
+
+
 # Material presets based on team 6238 feeds/speeds document
 MATERIAL_PRESETS = {
     'plywood': {
@@ -101,6 +608,31 @@ MATERIAL_PRESETS = {
 
 
 class FRCPostProcessor:
+    # Fixed attribute layout: no per-instance __dict__. Every attribute set in
+    # this class (or assigned by callers such as the GUI) must be listed here.
+    __slots__ = (
+        # Configuration and tool/stock geometry
+        'config', 'material_thickness', 'tool_diameter', 'tool_radius', 'units',
+        'tolerance', 'min_millable_hole',
+        # Z references
+        'sacrifice_board_depth', 'clearance_height', 'retract_height', 'material_top', 'cut_depth',
+        # Feeds, speeds and material preset values
+        'material_name', 'spindle_speed', 'feed_rate', 'ramp_feed_rate', 'plunge_rate',
+        'traverse_rate', 'approach_rate', 'ramp_angle', 'ramp_start_clearance',
+        'stepover_percentage', 'helix_radius_multiplier', 'peck_drill_depth', 'max_slotting_depth',
+        # Tabs and fixturing
+        'tabs_enabled', 'tab_width', 'tab_height', 'tab_spacing', 'pause_before_perimeter',
+        # Tube facing
+        'tube_facing_offset', 'tube_facing_params', 'tube_height',
+        # Machine and team information
+        'machine_park_x', 'machine_park_y', 'machine_park_z', 'team_number', 'team_name',
+        'machine_name', 'machine_controller', 'machine_coolant', 'user_name',
+        # Loaded geometry and classification results
+        'layer_data', 'lines', 'arcs', 'circles', 'splines', 'polylines',
+        'holes', 'pockets', 'pocket_polygons', 'perimeter',
+        'errors',
+    )
+
     def __init__(self, material_thickness: float, tool_diameter: float, units: str = "inch",
                  config: Optional[TeamConfig] = None):
         """
@@ -115,28 +647,31 @@ class FRCPostProcessor:
         """
         # Use provided config or create default (Team 6238 defaults)
         if config is None:
-            config = TeamConfig()
+            config = TeamConfig.default()
         self.config = config
 
+        # Resolve all scalar settings once; plain attribute reads from here on
+        settings = config.freeze()
+
         self.material_thickness = material_thickness
         self.tool_diameter = tool_diameter
         self.tool_radius = tool_diameter / 2
         self.units = units
 
         # Hole detection tolerance from config
-        self.tolerance = config.hole_detection_tolerance
+        self.tolerance = settings.hole_detection_tolerance
 
         # Minimum hole diameter that can be milled (must be > tool diameter for chip evacuation)
         # Holes smaller than this are skipped
-        self.min_millable_hole = tool_diameter * config.min_millable_hole_multiplier
+        self.min_millable_hole = tool_diameter * settings.min_millable_hole_multiplier
 
         # Multi-layer support
         self.layer_data = None  # Set by load_dxf for multi-layer DXFs
 
         # Z-axis reference: Z=0 is at BOTTOM (sacrifice board surface)
         # This allows zeroing to the sacrifice board instead of material top
-        self.sacrifice_board_depth = config.sacrifice_board_depth  # How far to cut into sacrifice board (inches)
-        self.clearance_height = config.clearance_height  # Clearance above material top for rapid moves (inches)
+        self.sacrifice_board_depth = settings.sacrifice_board_depth  # How far to cut into sacrifice board (inches)
+        self.clearance_height = settings.clearance_height  # Clearance above material top for rapid moves (inches)
 
         # Calculated Z positions (Z=0 at sacrifice board)
         self.retract_height = material_thickness + self.clearance_height  # Retract above material for operations
@@ -155,31 +690,31 @@ class FRCPostProcessor:
         self.stepover_percentage = 0.6  # Radial stepover as fraction of tool diameter (default 60%)
 
         # Tab parameters from config
-        self.tabs_enabled = config.tabs_enabled  # Whether tabs are enabled
-        self.tab_width = config.tab_width  # Width of tabs (inches)
-        self.tab_height = config.tab_height  # How much material to leave in tab (inches)
-        self.tab_spacing = config.tab_spacing  # Desired spacing between tabs (inches)
+        self.tabs_enabled = settings.tabs_enabled  # Whether tabs are enabled
+        self.tab_width = settings.tab_width  # Width of tabs (inches)
+        self.tab_height = settings.tab_height  # How much material to leave in tab (inches)
+        self.tab_spacing = settings.tab_spacing  # Desired spacing between tabs (inches)
 
         # Fixturing preferences from config
-        self.pause_before_perimeter = config.pause_before_perimeter  # Pause before perimeter for screw fixturing
+        self.pause_before_perimeter = settings.pause_before_perimeter  # Pause before perimeter for screw fixturing
 
         # Tube facing parameters
         self.tube_facing_offset = 0.0625  # Hole offset to align with faced surface at Y=+1/16" (inches)
 
         # Tube facing operation constants from config
-        self.tube_facing_params = config.get_tube_facing_params()
+        self.tube_facing_params = config.tube_facing_params
 
         # Machine-specific constants from config
-        self.machine_park_x = config.machine_park_x  # X position for machine park (machine coordinates)
-        self.machine_park_y = config.machine_park_y  # Y position for machine park (machine coordinates)
-        self.machine_park_z = config.machine_park_z  # Z position for safe clearance (machine coordinates)
+        self.machine_park_x = settings.machine_park_x  # X position for machine park (machine coordinates)
+        self.machine_park_y = settings.machine_park_y  # Y position for machine park (machine coordinates)
+        self.machine_park_z = settings.machine_park_z  # Z position for safe clearance (machine coordinates)
 
         # Team information from config
-        self.team_number = config.team_number  # FRC team number
-        self.team_name = config.team_name  # FRC team name
-        self.machine_name = config.machine_name  # Machine name
-        self.machine_controller = config.machine_controller  # Controller type
-        self.machine_coolant = config.machine_coolant  # Coolant type
+        self.team_number = settings.team_number  # FRC team number
+        self.team_name = settings.team_name  # FRC team name
+        self.machine_name = settings.machine_name  # Machine name
+        self.machine_controller = settings.machine_controller  # Controller type
+        self.machine_coolant = settings.machine_coolant  # Coolant type
 
         # Helix entry radius multiplier (applied to tool diameter)
         # Overridden by material presets
@@ -264,7 +799,15 @@ class FRCPostProcessor:
 
     def _distance_2d(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
         """Calculate 2D Euclidean distance between two points"""
-        return math.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        return math.sqrt(dx * dx + dy * dy)
+
+    def _distance_2d_sq(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+        """Squared 2D distance, for comparisons that don't need the sqrt"""
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        return dx * dx + dy * dy
 
     def _get_polygon_center(self, polygon) -> Tuple[float, float]:
         """
@@ -435,7 +978,7 @@ class FRCPostProcessor:
         self.layer_data = {}
 
         # Sort layers by depth (shallowest first, but we'll process deepest first except perimeter)
-        sorted_layers = sorted(layers_with_depths.items(), key=lambda x: x[1], reverse=True)
+        sorted_layers = sorted(layers_with_depths.items(), key=itemgetter(1), reverse=True)
 
         for layer_name, depth in sorted_layers:
             print(f"  Processing layer {layer_name} (Z={depth:.4f}\")")
@@ -663,9 +1206,10 @@ class FRCPostProcessor:
         
         # Build adjacency graph
         tolerance = 0.01  # 0.01" tolerance for matching endpoints
+        tolerance_sq = tolerance * tolerance
 
-        def points_match(p1, p2, tol=tolerance):
-            return self._distance_2d(p1, p2) < tol
+        def points_match(p1, p2, tol_sq=tolerance_sq):
+            return self._distance_2d_sq(p1, p2) < tol_sq
         
         # Find which segments connect to which
         graph = defaultdict(list)  # endpoint -> list of (segment_idx, is_start)
@@ -1052,28 +1596,36 @@ class FRCPostProcessor:
         """Classify holes by diameter"""
         # Classify all circles as holes (apply size check)
         self.holes = []
+        append_hole = self.holes.append
 
-        for circle in self.circles:
+        # Both thresholds are fixed for the whole pass; read them once
+        tool_diameter = self.tool_diameter
+        min_millable_hole = self.min_millable_hole
+
+        # Size checks for every circle at once, on a flat array of diameters
+        circles = self.circles
+        diameters = np.fromiter((circle['diameter'] for circle in circles), dtype=np.float64, count=len(circles))
+        too_small = (diameters < tool_diameter).tolist()
+        needs_peck = (diameters < min_millable_hole).tolist()
+
+        for circle, is_too_small, needs_peck_drill in zip(circles, too_small, needs_peck):
             diameter = circle['diameter']
             center = circle['center']
 
             # Check if hole is too small to mill with this tool
-            if diameter < self.tool_diameter:
-                error_msg = f"Hole at ({center[0]:.3f}, {center[1]:.3f}) has diameter {diameter:.3f}\" which is too small for {self.tool_diameter:.3f}\" tool"
+            if is_too_small:
+                error_msg = f"Hole at ({center[0]:.3f}, {center[1]:.3f}) has diameter {diameter:.3f}\" which is too small for {tool_diameter:.3f}\" tool"
                 self._add_error(error_msg)
                 continue
 
             # Determine machining strategy based on hole size
-            if diameter < self.min_millable_hole:
+            append_hole({'center': center, 'diameter': diameter, 'needs_peck_drill': needs_peck_drill})
+            if needs_peck_drill:
                 # Hole is larger than tool but too small to helical entry
                 # Use peck drilling to get down, then spiral clear at bottom
-                strategy = 'peck+spiral'
-                self.holes.append({'center': center, 'diameter': diameter, 'needs_peck_drill': True})
                 print(f"  Hole (d={diameter:.3f}\") at ({center[0]:.3f}, {center[1]:.3f}) - using peck drill + spiral")
             else:
                 # Hole is large enough for helical entry
-                strategy = 'helical+spiral'
-                self.holes.append({'center': center, 'diameter': diameter, 'needs_peck_drill': False})
                 print(f"  Hole (d={diameter:.3f}\") at ({center[0]:.3f}, {center[1]:.3f}) - using helical + spiral")
 
         print(f"\nIdentified {len(self.holes)} millable holes")
@@ -1101,78 +1653,8 @@ class FRCPostProcessor:
         if len(items) <= 1:
             return items, 0.0, 0
 
-        # Phase 1: Nearest Neighbor Algorithm
-        # Start at origin (0, 0) and build route by always going to nearest unvisited item
-        unvisited = items.copy()
-        route = []
-        current_pos = (0, 0)  # Start at origin
-
-        while unvisited:
-            # Find nearest unvisited item
-            nearest_idx = 0
-            nearest_dist = self._distance_2d(current_pos, unvisited[0]['center'])
-
-            for i in range(1, len(unvisited)):
-                dist = self._distance_2d(current_pos, unvisited[i]['center'])
-                if dist < nearest_dist:
-                    nearest_dist = dist
-                    nearest_idx = i
-
-            # Add nearest item to route and remove from unvisited
-            nearest_item = unvisited.pop(nearest_idx)
-            route.append(nearest_item)
-            current_pos = nearest_item['center']
-
-        # Phase 2: 2-opt Optimization
-        # Try swapping edge pairs to reduce total distance
-        improved = True
-        max_iterations = 100
-        iteration = 0
-
-        while improved and iteration < max_iterations:
-            improved = False
-            iteration += 1
-
-            for i in range(len(route) - 1):
-                for j in range(i + 2, len(route)):
-                    # 2-opt: reverse segment from i to j-1
-                    # Changes edges: (i-1)→(i) and (j-1)→(j)
-                    # Into edges: (i-1)→(j-1) and (i)→(j)
-
-                    # Get the points before and after the segment to reverse
-                    if i == 0:
-                        point_before = (0, 0)  # Origin
-                    else:
-                        point_before = route[i - 1]['center']
-
-                    if j < len(route):
-                        point_after = route[j]['center']
-                    else:
-                        point_after = None  # No point after (j is at end)
-
-                    point_i = route[i]['center']
-                    point_j_minus_1 = route[j - 1]['center']
-
-                    # Calculate distance before swap
-                    dist_before = self._distance_2d(point_before, point_i)
-                    if point_after is not None:
-                        dist_before += self._distance_2d(point_j_minus_1, point_after)
-
-                    # Calculate distance after swap (reversing segment i to j-1)
-                    dist_after = self._distance_2d(point_before, point_j_minus_1)
-                    if point_after is not None:
-                        dist_after += self._distance_2d(point_i, point_after)
-
-                    # If swap improves distance, do it
-                    if dist_after < dist_before:
-                        # Reverse the segment from i to j-1
-                        route[i:j] = reversed(route[i:j])
-                        improved = True
-
-        # Calculate total travel distance
-        total_dist = self._distance_2d((0, 0), route[0]['center'])
-        for i in range(len(route) - 1):
-            total_dist += self._distance_2d(route[i]['center'], route[i + 1]['center'])
+        tour, total_dist, iteration = _solve_tour([item['center'] for item in items])
+        route = [items[idx] for idx in tour]
 
         print(f"Optimized {len(route)} {item_type} - total travel: {total_dist:.2f}\" ({iteration} 2-opt iterations)")
 
@@ -1266,10 +1748,13 @@ class FRCPostProcessor:
             self.pockets = []
             return
 
-        # Find the largest polygon (perimeter)
-        polygons.sort(key=lambda x: x[0].area, reverse=True)
+        # Find the largest polygon (perimeter). Areas are computed once in a
+        # single vectorized call and reused for the size check below.
+        areas = shapely.area([poly for poly, _, _ in polygons]).tolist()
+        order = sorted(range(len(polygons)), key=areas.__getitem__, reverse=True)
+        polygons = [polygons[k] for k in order]
         candidate_perimeter = polygons[0][1]  # Get the original points
-        candidate_poly = polygons[0][0]
+        candidate_area = areas[order[0]]
         perimeter_path_idx = polygons[0][2]
 
         # Validate that the perimeter is reasonable
@@ -1282,7 +1767,7 @@ class FRCPostProcessor:
             bbox_area = bbox_width * bbox_height
 
             # If the candidate perimeter is < 10% of the bounding box area, it's probably not the real perimeter
-            perimeter_area = candidate_poly.area
+            perimeter_area = candidate_area
             if perimeter_area < 0.1 * bbox_area:
                 # Only report as error if we had actual polylines (not just converted circles)
                 # If we only converted circles and the largest isn't big enough, silently skip perimeter
@@ -1724,6 +2209,10 @@ class FRCPostProcessor:
         # These should become ring polygons (donut shapes with holes)
         used_circles = set()
 
+        # Spatial index over circle centers so each circle only compares
+        # against the few centers near it instead of every other circle
+        center_tree = STRtree(shapely.points([circle['center'] for circle in circles])) if circles else None
+
         for i, circle1 in enumerate(circles):
             if i in used_circles:
                 continue
@@ -1731,9 +2220,13 @@ class FRCPostProcessor:
             center1 = circle1['center']
             radius1 = circle1['radius']
 
-            # Look for concentric circles
+            # Look for concentric circles among the indexed neighbors; the search
+            # box is padded past the 0.001" tolerance, which is applied exactly below
+            nearby = center_tree.query(box(center1[0] - 0.002, center1[1] - 0.002,
+                                           center1[0] + 0.002, center1[1] + 0.002))
             concentric_group = [circle1]
-            for j, circle2 in enumerate(circles):
+            for j in sorted(nearby.tolist()):
+                circle2 = circles[j]
                 if i == j or j in used_circles:
                     continue
 
@@ -1758,7 +2251,7 @@ class FRCPostProcessor:
             else:
                 # Multiple concentric circles - create ring with holes
                 # Sort by radius (largest first)
-                concentric_group.sort(key=lambda c: c['radius'], reverse=True)
+                concentric_group.sort(key=itemgetter('radius'), reverse=True)
 
                 # Outer boundary is the largest circle
                 outer_circle = concentric_group[0]
@@ -2409,17 +2902,7 @@ class FRCPostProcessor:
         # Total depth to cut (from ramp start height down to cut depth)
         total_depth = ramp_start_height - self.cut_depth
 
-        # Circumference of one revolution
-        circumference = 2 * math.pi * toolpath_radius
-
-        # For target angle: depth_per_rev = circumference * tan(angle)
-        target_depth_per_rev = circumference * math.tan(math.radians(target_angle_deg))
-
-        # Number of passes needed
-        num_passes = max(1, int(math.ceil(total_depth / target_depth_per_rev)))
-        depth_per_pass = total_depth / num_passes
-
-        return num_passes, depth_per_pass
+        return _helical_pass_plan(total_depth, toolpath_radius, target_angle_deg)
 
     def _generate_peck_drill_and_spiral_gcode(self, cx: float, cy: float, diameter: float, final_toolpath_radius: float) -> List[str]:
         """
@@ -2612,8 +3095,9 @@ class FRCPostProcessor:
 
         for line in gcode_lines:
             # Remove comments
-            line = re.sub(r'\(.*?\)', '', line).strip()
-            line = re.sub(r';.*$', '', line).strip()
+            if '(' in line or ';' in line:
+                line = _GCODE_COMMENT_RE.sub('', line)
+            line = line.strip()
 
             if not line:
                 continue
@@ -2621,13 +3105,10 @@ class FRCPostProcessor:
             # Parse G-code command
             if line.startswith('G0'):
                 # Rapid move
-                x, y, z = current_x, current_y, current_z
-                if 'X' in line:
-                    x = float(re.search(r'X([-\d.]+)', line).group(1))
-                if 'Y' in line:
-                    y = float(re.search(r'Y([-\d.]+)', line).group(1))
-                if 'Z' in line:
-                    z = float(re.search(r'Z([-\d.]+)', line).group(1))
+                words = _gcode_words(line)
+                x = float(words['X']) if 'X' in words else current_x
+                y = float(words['Y']) if 'Y' in words else current_y
+                z = float(words['Z']) if 'Z' in words else current_z
 
                 distance = math.sqrt((x - current_x)**2 + (y - current_y)**2 + (z - current_z)**2)
                 rapid_time += distance / rapid_speed * 60  # Convert to seconds
@@ -2636,19 +3117,14 @@ class FRCPostProcessor:
 
             elif line.startswith('G1'):
                 # Linear cutting move
-                x, y, z = current_x, current_y, current_z
+                words = _gcode_words(line)
+                x = float(words['X']) if 'X' in words else current_x
+                y = float(words['Y']) if 'Y' in words else current_y
+                z = float(words['Z']) if 'Z' in words else current_z
+                if 'F' in words:
+                    current_feed = float(words['F'])
                 feed = current_feed
 
-                if 'X' in line:
-                    x = float(re.search(r'X([-\d.]+)', line).group(1))
-                if 'Y' in line:
-                    y = float(re.search(r'Y([-\d.]+)', line).group(1))
-                if 'Z' in line:
-                    z = float(re.search(r'Z([-\d.]+)', line).group(1))
-                if 'F' in line:
-                    feed = float(re.search(r'F([-\d.]+)', line).group(1))
-                    current_feed = feed
-
                 distance = math.sqrt((x - current_x)**2 + (y - current_y)**2 + (z - current_z)**2)
                 cutting_time += distance / feed * 60  # Convert to seconds
 
@@ -2656,26 +3132,17 @@ class FRCPostProcessor:
 
             elif line.startswith('G2') or line.startswith('G3'):
                 # Arc move
-                x, y, z = current_x, current_y, current_z
+                words = _gcode_words(line)
+                x = float(words['X']) if 'X' in words else current_x
+                y = float(words['Y']) if 'Y' in words else current_y
+                z = float(words['Z']) if 'Z' in words else current_z
+                if 'F' in words:
+                    current_feed = float(words['F'])
                 feed = current_feed
 
-                if 'X' in line:
-                    x = float(re.search(r'X([-\d.]+)', line).group(1))
-                if 'Y' in line:
-                    y = float(re.search(r'Y([-\d.]+)', line).group(1))
-                if 'Z' in line:
-                    z = float(re.search(r'Z([-\d.]+)', line).group(1))
-                if 'F' in line:
-                    feed = float(re.search(r'F([-\d.]+)', line).group(1))
-                    current_feed = feed
-
                 # Get arc center offsets
-                i = 0.0
-                j = 0.0
-                if 'I' in line:
-                    i = float(re.search(r'I([-\d.]+)', line).group(1))
-                if 'J' in line:
-                    j = float(re.search(r'J([-\d.]+)', line).group(1))
+                i = float(words['I']) if 'I' in words else 0.0
+                j = float(words['J']) if 'J' in words else 0.0
 
                 # Calculate arc length (approximate)
                 center_x = current_x + i
@@ -2707,9 +3174,9 @@ class FRCPostProcessor:
 
             elif line.startswith('G4'):
                 # Dwell
-                if 'P' in line:
-                    dwell_seconds = float(re.search(r'P([-\d.]+)', line).group(1))
-                    dwell_time += dwell_seconds
+                words = _gcode_words(line)
+                if 'P' in words:
+                    dwell_time += float(words['P'])
 
         total_time = cutting_time + rapid_time + dwell_time
 
@@ -2744,25 +3211,24 @@ class FRCPostProcessor:
         Returns:
             True if pocket is circular, False otherwise
         """
-        pocket_poly = Polygon(pocket_points)
-        cx = pocket_poly.centroid.x
-        cy = pocket_poly.centroid.y
+        # Fewer than 3 vertices can't enclose an area (and can't build a Polygon)
+        if len(pocket_points) < 3:
+            return False
 
-        # Calculate distances from centroid to all vertices
-        distances = []
-        for x, y in pocket_points:
-            dist = self._distance_2d((x, y), (cx, cy))
-            distances.append(dist)
+        centroid = Polygon(pocket_points).centroid  # Computed once, read for both axes
 
-        if not distances:
-            return False
+        # Calculate distances from centroid to all vertices in one array pass
+        points = np.asarray(pocket_points, dtype=np.float64)
+        dx = points[:, 0] - centroid.x
+        dy = points[:, 1] - centroid.y
+        distances = np.sqrt(dx * dx + dy * dy)
 
         # Check if all distances are within tolerance of the average
-        avg_dist = sum(distances) / len(distances)
-        max_deviation = max(abs(d - avg_dist) for d in distances)
+        avg_dist = distances.mean()
+        max_deviation = np.abs(distances - avg_dist).max()
         relative_deviation = max_deviation / avg_dist if avg_dist > 0 else 0
 
-        return relative_deviation < tolerance
+        return bool(relative_deviation < tolerance)
 
     def _generate_pocket_gcode(self, pocket_points: List[Tuple[float, float]]) -> List[str]:
         """Generate G-code for a pocket with tool compensation (offset inward) and helical entry.
@@ -3302,15 +3768,12 @@ class FRCPostProcessor:
             actual_depth_per_pass = total_cut_depth / num_passes
             gcode.append(f"(Multi-pass {contour_type}: {num_passes} passes @ {actual_depth_per_pass:.3f}\" each, max {self.max_slotting_depth:.3f}\" per pass)")
 
-        # Create offset path
-        contour_poly = Polygon(contour_points)
-
-        # Buffer by tool radius (positive for outward/perimeter, negative for inward/pocket)
+        # Create offset path: buffer by tool radius (positive for outward/perimeter, negative for inward/pocket)
         offset_distance = offset_direction * self.tool_radius
-        offset_poly = contour_poly.buffer(offset_distance)
+        offset_poly = _offset_contour(tuple(map(tuple, contour_points)), offset_distance)
 
         if offset_poly.is_empty:
-            center_x, center_y = self._get_polygon_center(contour_poly)
+            center_x, center_y = self._get_polygon_center(Polygon(contour_points))
             error_msg = f"{contour_type.capitalize()} at approximately ({center_x:.3f}, {center_y:.3f}) failed offset operation - may have internal corners with radius smaller than {self.tool_diameter:.4f}\" tool can mill"
             self._add_error(error_msg)
             return gcode
@@ -3323,18 +3786,17 @@ class FRCPostProcessor:
             if clockwise:
                 offset_points = offset_points[::-1]
         else:
-            center_x, center_y = self._get_polygon_center(contour_poly)
+            center_x, center_y = self._get_polygon_center(Polygon(contour_points))
             error_msg = f"{contour_type.capitalize()} at approximately ({center_x:.3f}, {center_y:.3f}) resulted in invalid geometry after tool compensation - may have internal corners too sharp for {self.tool_diameter:.4f}\" tool"
             self._add_error(error_msg)
             return gcode
 
-        # Calculate segment lengths
-        segment_lengths = []
-        for i in range(len(offset_points)):
-            p1 = offset_points[i]
-            p2 = offset_points[(i + 1) % len(offset_points)]
-            length = self._distance_2d(p1, p2)
-            segment_lengths.append(length)
+        # Calculate segment lengths (each point paired with the next, wrapping to the start)
+        distance = self._distance_2d  # Bound once for the per-segment loop
+        segment_lengths = [
+            distance(p1, p2)
+            for p1, p2 in zip(offset_points, offset_points[1:] + offset_points[:1])
+        ]
 
         # Calculate total contour length
         contour_length = sum(segment_lengths)
@@ -3520,7 +3982,7 @@ class FRCPostProcessor:
 
                 # Segment has tabs - split it into subsegments
                 # Sort intersecting tabs by start distance
-                intersecting_tabs.sort(key=lambda x: x[0])
+                intersecting_tabs.sort(key=itemgetter(0))
 
                 # Build list of subsegments: [(start_dist, end_dist, is_tab), ...]
                 subsegments = []
@@ -3602,7 +4064,7 @@ class FRCPostProcessor:
 
             # Store tab positions from final pass for removal
             if is_final_pass:
-                all_tab_positions = sorted(tab_waypoints_by_idx.items(), key=lambda kv: kv[0])
+                all_tab_positions = sorted(tab_waypoints_by_idx.items(), key=itemgetter(0))
 
             # Retract
             gcode.append(f"G0 Z{self.retract_height:.4f}  ; Retract")
@@ -3714,13 +4176,36 @@ class FRCPostProcessor:
         Returns:
             Modified G-code line with offset coordinate
         """
+        # Most lines (Z-only moves, M-codes, comments) lack the axis - skip the regex
+        if axis not in line:
+            return line
+
         def replace_coord(match):
             coord_val = float(match.group(1))
             new_val = coord_val + offset
             return f'{axis}{new_val:.4f}'
 
         # Match axis letter followed by optional minus and digits
-        return re.sub(rf'{axis}(-?\d+\.?\d*)', replace_coord, line)
+        return _COORD_RE[axis].sub(replace_coord, line)
+
+    def _offset_coordinate_lines(self, lines: List[str], axis: str, offset: float) -> List[str]:
+        """
+        Offset a coordinate across many G-code lines with a single substitution.
+
+        Same result as calling _offset_coordinate() per line, but the lines are
+        joined into one block so the regex runs once instead of once per line.
+
+        Args:
+            lines: G-code lines to modify (without newlines)
+            axis: Coordinate axis to offset ('X', 'Y', or 'Z')
+            offset: Offset to add to coordinate value
+
+        Returns:
+            Modified G-code lines
+        """
+        if not lines:
+            return []
+        return self._offset_coordinate('\n'.join(lines), axis, offset).split('\n')
 
     def _adjust_y_coordinate(self, line: str, y_offset: float) -> str:
         """
@@ -3734,45 +4219,15 @@ class FRCPostProcessor:
         Calculate pass parameters for tube operations (facing, cutting).
 
         Common calculation for both tube facing and cut-to-length operations.
-        Both use the same depth strategy: cut just over half the tube height,
-        with multiple passes to respect flute length limits.
+        See _tube_operation_passes() for the returned keys.
 
         Args:
             tube_height: Height of tube in inches (Z dimension)
 
         Returns:
-            Dict with pass calculation results:
-            - total_depth: Total depth to cut
-            - wall_thickness: Wall thickness from material_thickness
-            - num_roughing_passes: Number of roughing passes needed
-            - roughing_depth_per_pass: Depth per roughing pass
-            - num_finishing_passes: Number of finishing passes needed
-            - finishing_depth_per_pass: Depth per finishing pass
+            Dict with pass calculation results
         """
-        # Cutting parameters
-        total_depth = tube_height / 2 + self.tube_facing_params['depth_margin']  # Just over half the tube height
-        wall_thickness = self.material_thickness  # Wall thickness of box tubing
-
-        # Roughing: respects flute length limit (max per pass from params)
-        # 1" tube (0.505"): 2 passes, 2" tube (1.005"): 4 passes
-        max_roughing_depth = self.tube_facing_params['max_roughing_depth']
-        num_roughing_passes = max(1, int(math.ceil(total_depth / max_roughing_depth)))
-        roughing_depth_per_pass = total_depth / num_roughing_passes
-
-        # Finishing: light stepover allows deeper passes (max per pass from params)
-        # 1" tube (0.505"): 1 pass, 2" tube (1.005"): 2 passes
-        max_finishing_depth = self.tube_facing_params['max_finishing_depth']
-        num_finishing_passes = max(1, int(math.ceil(total_depth / max_finishing_depth)))
-        finishing_depth_per_pass = total_depth / num_finishing_passes
-
-        return {
-            'total_depth': total_depth,
-            'wall_thickness': wall_thickness,
-            'num_roughing_passes': num_roughing_passes,
-            'roughing_depth_per_pass': roughing_depth_per_pass,
-            'num_finishing_passes': num_finishing_passes,
-            'finishing_depth_per_pass': finishing_depth_per_pass
-        }
+        return _tube_operation_passes(tube_height, self.material_thickness, self.tube_facing_params)
 
     def _parse_tube_size(self, tube_size: str) -> tuple[float, float]:
         """
@@ -3798,239 +4253,6 @@ class FRCPostProcessor:
             # Default to 1x1 if unknown
             return (1.0, 1.0)
 
-    def _generate_parametric_tube_facing(self, tube_width: float, tube_height: float,
-                                          phase: int = 1) -> list[str]:
-        """
-        Generate tube facing toolpath - face the end of box tubing.
-
-        Squares the end of box tubing with one vertical plunge and two
-        horizontal passes (roughing + finishing).
-
-        Coordinate system (tube lying horizontal, end facing spindle):
-        - X: across tube width (cut direction)
-        - Z: tube height (plunge direction, vertical)
-        - Y: facing depth (material removal from tube end, negative = into tube)
-
-        Phase 1 (first end):
-        - Roughing tool edge at Y=+0.05"
-        - Finishing tool edge at Y=+0.0625"
-
-        Phase 2 (after flip):
-        - Roughing tool edge at Y=-0.0125"
-        - Finishing tool edge at Y=0"
-
-        Args:
-            tube_width: Tube width in inches (X dimension)
-            tube_height: Tube height in inches (Z dimension, typically 1" or 2")
-            phase: 1 for first end (with stepover), 2 for second end (no stepover)
-
-        Returns:
-            List of G-code lines for the facing operation
-        """
-        gcode = []
-        tool_radius = self.tool_diameter / 2.0
-
-        # Calculate pass parameters using shared helper
-        passes = self._calculate_tube_operation_passes(tube_height)
-        total_depth = passes['total_depth']
-        wall_thickness = passes['wall_thickness']
-        num_roughing_passes = passes['num_roughing_passes']
-        roughing_depth_per_pass = passes['roughing_depth_per_pass']
-        num_finishing_passes = passes['num_finishing_passes']
-        finishing_depth_per_pass = passes['finishing_depth_per_pass']
-
-        # Tool edge positions for each phase (these are the final face positions)
-        if phase == 1:
-            # Phase 1: Roughing and finishing positions from params
-            roughing_tool_edge = self.tube_facing_params['roughing_tool_edge_p1']
-            finishing_tool_edge = self.tube_facing_params['finishing_tool_edge_p1']
-        else:
-            # Phase 2: Roughing and finishing positions from params
-            roughing_tool_edge = self.tube_facing_params['roughing_tool_edge_p2']
-            finishing_tool_edge = self.tube_facing_params['finishing_tool_edge_p2']
-
-        # Arc clearing parameters (needed to calculate roughing_y offset)
-        arc_advance = self.tube_facing_params['arc_advance']  # How far each arc advances in X
-        arc_radius = self.tube_facing_params['arc_radius']  # Arc radius
-        half_advance = arc_advance / 2
-        j_offset = math.sqrt(arc_radius**2 - half_advance**2)
-
-        # Tool CENTER positions for tube facing:
-        # - Coordinate system: +Y is INTO the tube (toward tube body)
-        # - Kept material (tube body) is at +Y, tube face is at Y≈0
-        # - Tool's +Y edge (toward tube body) defines the face position
-        #
-        # With positive J, G3 (CCW) arc goes through TOP of circle (max Y).
-        # Arc center Y = roughing_y + j_offset
-        # Top of circle Y = center_y + arc_radius = roughing_y + j_offset + arc_radius
-        #
-        # At arc CHORD (start/end): tool center Y = roughing_y
-        # At arc PEAK (top of circle): tool center Y = roughing_y + j_offset + arc_radius
-        #
-        # The PEAK is where the tool cuts deepest into the tube (maximum +Y edge).
-        # Roughing should never exceed roughing_tool_edge, so we set PEAK at that limit.
-        #
-        # For roughing +Y edge at PEAK to equal roughing_tool_edge:
-        #   (roughing_y + j_offset + arc_radius) + tool_radius = roughing_tool_edge
-        #   roughing_y = roughing_tool_edge - tool_radius - j_offset - arc_radius
-        roughing_y = roughing_tool_edge - tool_radius - j_offset - arc_radius
-        finishing_y = finishing_tool_edge - tool_radius
-
-        # X positions (tool edge 0.05" from material edge)
-        clearance = tool_radius + 0.05
-        start_x = tube_width + clearance  # Far side
-        end_x = -clearance  # Near side
-
-        # Z positions
-        z_top = tube_height  # Top of tube
-        z_safe = tube_height + 0.25  # Safe height above tube
-        z_final = z_top - total_depth  # Final depth (just over half height)
-
-        chord_face = roughing_y + tool_radius  # Face position at chord (start/end of arc)
-        gcode.append(f'( Tube facing: {tube_width:.2f}" wide x {tube_height:.2f}" tall )')
-        gcode.append(f'( Tool: {self.tool_diameter:.3f}" )')
-        gcode.append(f'( Total depth: {total_depth:.3f}" )')
-        gcode.append(f'( Roughing: {num_roughing_passes} passes of {roughing_depth_per_pass:.3f}" each, +Y edge at Y={roughing_tool_edge:.4f}" )')
-        gcode.append(f'( Finishing: {num_finishing_passes} passes of {finishing_depth_per_pass:.3f}" each, +Y edge at Y={finishing_tool_edge:.4f}" )')
-
-        # === ROUGHING PASSES ===
-        arc_feed = self.feed_rate
-
-        gcode.append('( === ROUGHING PASSES === )')
-        gcode.append(f'( {num_roughing_passes} depth passes with arc clearing )')
-
-        # Calculate wall boundaries for subsequent passes (box tubing is hollow)
-        # Back wall (far side): from start_x to inner edge
-        back_wall_inner_x = tube_width - wall_thickness - clearance
-        # Front wall (near side): from inner edge to end_x
-        front_wall_inner_x = wall_thickness + clearance
-
-        for pass_num in range(num_roughing_passes):
-            z_cut = z_top - (pass_num + 1) * roughing_depth_per_pass
-
-            if pass_num == 0:
-                # First pass: full arc pattern across entire width
-                gcode.append(f'( Roughing pass {pass_num + 1}/{num_roughing_passes} to Z={z_cut:.3f}" - full width )')
-
-                # Position at start
-                gcode.append(f'G0 X{start_x:.4f} Y{roughing_y:.4f}')
-                gcode.append(f'G0 Z{z_safe:.4f}')
-
-                # Plunge to cut depth
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Arc clearing pattern across tube width
-                gcode.append(f'G1 F{arc_feed}')
-                current_x = start_x
-                while current_x > end_x + arc_advance:
-                    next_x = current_x - arc_advance
-                    gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
-                    current_x = next_x
-
-                # Final linear move to end position if needed
-                if current_x > end_x:
-                    gcode.append(f'G1 X{end_x:.4f}')
-
-                # Retract after this pass
-                gcode.append(f'G0 Z{z_safe:.4f}')
-            else:
-                # Subsequent passes: cut walls only, rapid across hollow middle
-                gcode.append(f'( Roughing pass {pass_num + 1}/{num_roughing_passes} to Z={z_cut:.3f}" - walls only )')
-
-                # Position at start (back wall)
-                gcode.append(f'G0 X{start_x:.4f} Y{roughing_y:.4f}')
-                gcode.append(f'G0 Z{z_safe:.4f}')
-
-                # Plunge to cut depth
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Arc clearing through back wall only
-                gcode.append(f'G1 F{arc_feed}')
-                current_x = start_x
-                while current_x > back_wall_inner_x + arc_advance:
-                    next_x = current_x - arc_advance
-                    gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
-                    current_x = next_x
-
-                # Finish back wall
-                if current_x > back_wall_inner_x:
-                    gcode.append(f'G1 X{back_wall_inner_x:.4f}')
-
-                # Retract, rapid across hollow middle
-                gcode.append(f'G0 Z{z_safe:.4f}')
-                gcode.append(f'G0 X{front_wall_inner_x:.4f}')
-
-                # Plunge inside (material already removed on pass 1)
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Arc clearing through front wall
-                gcode.append(f'G1 F{arc_feed}')
-                current_x = front_wall_inner_x
-                while current_x > end_x + arc_advance:
-                    next_x = current_x - arc_advance
-                    gcode.append(f'G3 X{next_x:.4f} Y{roughing_y:.4f} I{-half_advance:.4f} J{j_offset:.4f}')
-                    current_x = next_x
-
-                # Final linear move to end position if needed
-                if current_x > end_x:
-                    gcode.append(f'G1 X{end_x:.4f}')
-
-                # Retract after this pass
-                gcode.append(f'G0 Z{z_safe:.4f}')
-
-        gcode.append(f'( Roughing complete: {num_roughing_passes} passes )')
-
-        # === FINISHING PASSES ===
-        stepover = finishing_tool_edge - roughing_tool_edge
-        gcode.append('( === FINISHING PASSES === )')
-        gcode.append(f'( {num_finishing_passes} depth passes, stepover {stepover:.4f}" )')
-
-        for pass_num in range(num_finishing_passes):
-            z_cut = z_top - (pass_num + 1) * finishing_depth_per_pass
-
-            if pass_num == 0:
-                # First pass: full cut across entire width
-                gcode.append(f'( Finishing pass {pass_num + 1}/{num_finishing_passes} to Z={z_cut:.3f}" - full width )')
-
-                # Position for finishing
-                gcode.append(f'G0 X{start_x:.4f} Y{finishing_y:.4f}')
-
-                # Plunge to cut depth
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Single horizontal cut across
-                gcode.append(f'G1 X{end_x:.4f} F{self.feed_rate}')
-
-                # Retract
-                gcode.append(f'G0 Z{z_safe:.4f}')
-            else:
-                # Subsequent passes: cut walls only, rapid across hollow middle
-                gcode.append(f'( Finishing pass {pass_num + 1}/{num_finishing_passes} to Z={z_cut:.3f}" - walls only )')
-
-                # Position at start (back wall)
-                gcode.append(f'G0 X{start_x:.4f} Y{finishing_y:.4f}')
-
-                # Plunge to cut depth
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Cut through back wall only
-                gcode.append(f'G1 X{back_wall_inner_x:.4f} F{self.feed_rate}')
-
-                # Retract, rapid across hollow middle
-                gcode.append(f'G0 Z{z_safe:.4f}')
-                gcode.append(f'G0 X{front_wall_inner_x:.4f}')
-
-                # Plunge inside (material already removed on pass 1)
-                gcode.append(f'G0 Z{z_cut:.4f}')  # Rapid plunge (in air)
-
-                # Cut through front wall
-                gcode.append(f'G1 X{end_x:.4f} F{self.feed_rate}')
-
-                # Retract
-                gcode.append(f'G0 Z{z_safe:.4f}')
-
-        return gcode
-
     def _generate_tube_facing_toolpath(self, tube_width: float, tube_height: float,
                                        tool_radius: float, stepover: float,
                                        stepdown: float, facing_depth: float,
@@ -4055,7 +4277,10 @@ class FRCPostProcessor:
         Returns:
             List of G-code lines for the facing operation
         """
-        return self._generate_parametric_tube_facing(tube_width, tube_height, phase)
+        # Cached toolpaths are shared tuples; callers may modify the returned list
+        return list(_tube_facing_toolpath(tube_width, tube_height, phase, self.tool_diameter,
+                                          self.feed_rate, self.material_thickness,
+                                          self.tube_facing_params))
 
     def generate_tube_facing_gcode(self, tube_size: str = '1x1', suggested_filename: str = None, timestamp: str = None) -> PostProcessorResult:
         """
@@ -4104,57 +4329,27 @@ class FRCPostProcessor:
         pass1_y_offset = 0
         pass2_y_offset = 0
 
-        gcode = []
-
         # Use provided timestamp (from client's timezone) or generate one
         if not timestamp:
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Format for G-code header (just date and time, no seconds)
-        timestamp_display = timestamp[:16]  # YYYY-MM-DD HH:MM
 
-        # === HEADER ===
-        gcode.append('( PENGUINCAM TUBE FACING OPERATION )')
-        gcode.append(f'( Generated: {timestamp_display} )')
-        gcode.append(f'( Tube size: {tube_size} )')
-        gcode.append(f'( Tool: {self.tool_diameter:.3f}" end mill )')
-        gcode.append('( )')
-        gcode.append('( SETUP INSTRUCTIONS: )')
-        gcode.append('( 1. Mount tube in jig with end facing user )')
-        gcode.append('( 2. Verify G55 is set to jig origin )')
-        gcode.append('( 3. Z=0 is at bottom of tube [jig surface] )')
-        gcode.append('( 4. Y=0 is at nominal end face of tube )')
-        gcode.append('( )')
-
-        # === INITIALIZATION ===
-        gcode.append('')
-        gcode.append('( === INITIALIZATION === )')
-        gcode.append('G90 G94 G91.1 G40 G49 G17')
-        gcode.append('G20')
-        gcode.append('G90  ; Absolute positioning mode')
-        gcode.append('')
-        gcode.append('( Tool and spindle )')
-        gcode.append('T1 M6')
-        gcode.append(f'S{self.spindle_speed} M3')
-        gcode.append('M7  ; Air blast on')
-        gcode.append('G4 P3.0')
-        gcode.append('')
-        gcode.append('G55  ; Use jig work coordinate system')
-        gcode.append('')
+        template_params = {
+            'timestamp_display': timestamp[:16],  # YYYY-MM-DD HH:MM (no seconds)
+            'tube_size': tube_size,
+            'tool_diameter': self.tool_diameter,
+            'spindle_speed': self.spindle_speed,
+            'park_x': self.machine_park_x,
+            'park_y': self.machine_park_y,
+            'park_z': self.machine_park_z,
+        }
 
-        # === PHASE 1: FACE FIRST HALF ===
-        gcode.append('( === PHASE 1: FACE FIRST HALF === )')
-        gcode.append('( Face from Y=-0.125 to Y=+0.125 )')
-        gcode.append('')
-        gcode.append(f'G53 G0 Z{self.machine_park_z:.4f}  ; Move to safe machine Z clearance')
-        gcode.append('G0 X0 Y0  ; Rapid to work origin')
-        gcode.append('')
+        # === HEADER, INITIALIZATION, PHASE 1: FACE FIRST HALF ===
+        gcode = _TUBE_FACING_HEADER_TEMPLATE.format_map(template_params).split('\n')
 
         # Add Phase 1 toolpath with Pass 1 Y offset
-        for line in phase1_toolpath:
-            line = line.strip()
-            if line and not line.startswith('G52'):
-                adjusted_line = self._adjust_y_coordinate(line, pass1_y_offset)
-                gcode.append(adjusted_line)
+        phase1_lines = [line.strip() for line in phase1_toolpath]
+        phase1_lines = [line for line in phase1_lines if line and not line.startswith('G52')]
+        gcode.extend(self._offset_coordinate_lines(phase1_lines, 'Y', pass1_y_offset))
 
         # === PAUSE FOR FLIP ===
         gcode.extend(self._generate_pause_and_park_gcode(
@@ -4166,29 +4361,15 @@ class FRCPostProcessor:
         ))
 
         # === PHASE 2: FACE SECOND HALF ===
-        gcode.append('( === PHASE 2: FACE SECOND HALF === )')
-        gcode.append('( Face from Y=-0.250 to Y=-0.125 )')
-        gcode.append('')
-        gcode.append(f'G53 G0 Z{self.machine_park_z:.4f}  ; Move to safe machine Z clearance')
-        gcode.append('G0 X0 Y0  ; Rapid to work origin')
-        gcode.append('')
+        gcode.extend(_TUBE_FACING_PHASE2_TEMPLATE.format_map(template_params).split('\n'))
 
         # Add Phase 2 toolpath with Pass 2 Y offset (no stepover - same Y for roughing/finishing)
-        for line in phase2_toolpath:
-            line = line.strip()
-            if line and not line.startswith('G52'):
-                adjusted_line = self._adjust_y_coordinate(line, pass2_y_offset)
-                gcode.append(adjusted_line)
+        phase2_lines = [line.strip() for line in phase2_toolpath]
+        phase2_lines = [line for line in phase2_lines if line and not line.startswith('G52')]
+        gcode.extend(self._offset_coordinate_lines(phase2_lines, 'Y', pass2_y_offset))
 
         # === END ===
-        gcode.append('')
-        gcode.append('( === PROGRAM END === )')
-        gcode.append(f'G53 G0 Z{self.machine_park_z:.4f}  ; Move to safe machine Z clearance')
-        gcode.append(f'G53 G0 X{self.machine_park_x} Y{self.machine_park_y}  ; Park at back of machine')
-        gcode.append('M9  ; Air blast off')
-        gcode.append('M5')
-        gcode.append('G54  ; Reset to standard work coordinate system')
-        gcode.append('M30')
+        gcode.extend(_TUBE_FACING_FOOTER_TEMPLATE.format_map(template_params).split('\n'))
 
         # Estimate cycle time
         time_estimate = self._estimate_cycle_time(gcode)
@@ -4352,7 +4533,7 @@ class FRCPostProcessor:
                 stepdown, facing_depth, finish_allowance
             )
 
-            # Facing toolpath Y coordinates are already absolute (calculated in _generate_parametric_tube_facing)
+            # Facing toolpath Y coordinates are already absolute (calculated in _tube_facing_toolpath)
             # No additional offset needed - the face positions are set by roughing_tool_edge/finishing_tool_edge
             for line in facing_toolpath:
                 gcode.append(line)
@@ -4403,7 +4584,7 @@ class FRCPostProcessor:
                 stepdown, facing_depth, finish_allowance, phase=2
             )
 
-            # Facing toolpath Y coordinates are already absolute (calculated in _generate_parametric_tube_facing)
+            # Facing toolpath Y coordinates are already absolute (calculated in _tube_facing_toolpath)
             # No additional offset needed - the face positions are set by roughing_tool_edge/finishing_tool_edge
             for line in facing_toolpath:
                 gcode.append(line)
@@ -4629,14 +4810,14 @@ class FRCPostProcessor:
             x_val = float(match.group(1))
             new_x = tube_width - x_val
             return f'X{new_x:.4f}'
-        line = re.sub(r'X(-?\d+\.?\d*)', replace_x, line)
+        line = _COORD_RE['X'].sub(replace_x, line)
 
         # Flip I offset sign (X component of arc center)
         def replace_i(match):
             i_val = float(match.group(1))
             new_i = -i_val
             return f'I{new_i:.4f}'
-        line = re.sub(r'I(-?\d+\.?\d*)', replace_i, line)
+        line = _COORD_RE['I'].sub(replace_i, line)
 
         return line
 
@@ -2024,6 +2024,21 @@ class OnshapeSessionManager:
 
         return client
 
+    def has_session(self, user_id):
+        """
+        Check whether Onshape tokens are present in the Flask session.
+
+        Cheaper than get_client() when the caller only needs to know if the
+        user is authenticated and never uses the client object.
+
+        Args:
+            user_id: User identifier (unused - tokens come from session cookie)
+
+        Returns:
+            True if Onshape tokens are stored in the session
+        """
+        return bool(session.get('onshape_tokens'))
+
     def update_session_tokens(self, client):
         """
         Update session tokens after potential refresh.
@@ -7,13 +7,14 @@ import os
 import sys
 import json
 from functools import wraps
-from flask import session, redirect, url_for, request, jsonify
+from flask import session, redirect, url_for, request, jsonify, g
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request as GoogleRequest
 from googleapiclient.discovery import build
 import secrets
 import logging
+from datetime import datetime
 
 # Configure logging for Vercel
 logging.basicConfig(
@@ -73,13 +74,14 @@ class PenguinCAMAuth:
         
         # Base URL for redirects
         config['base_url'] = os.environ.get('BASE_URL', 'http://localhost:6238')
+        config['redirect_uri'] = config['base_url'].rstrip('/') + '/auth/callback'
         
         # Allowed domains/emails
         env_domains = os.environ.get('ALLOWED_DOMAINS', '')
-        config['allowed_domains'] = [d.strip() for d in env_domains.split(',') if d.strip()]
+        config['allowed_domains'] = frozenset(d.strip() for d in env_domains.split(',') if d.strip())
         
         env_emails = os.environ.get('ALLOWED_EMAILS', '')
-        config['allowed_emails'] = [e.strip() for e in env_emails.split(',') if e.strip()]
+        config['allowed_emails'] = frozenset(e.strip() for e in env_emails.split(',') if e.strip())
         
         config['require_domain'] = True
         config['session_timeout'] = 86400  # 24 hours
@@ -106,6 +108,11 @@ class PenguinCAMAuth:
         if not creds_data:
             return None
         
+        # Reuse credentials already rebuilt during this request
+        cached = getattr(g, '_google_creds', None)
+        if cached and cached[0] == creds_data['token']:
+            return cached[1]
+        
         # Reconstruct credentials from session
         creds = Credentials(
             token=creds_data['token'],
@@ -113,15 +120,17 @@ class PenguinCAMAuth:
             token_uri=creds_data.get('token_uri'),
             client_id=creds_data.get('client_id'),
             client_secret=creds_data.get('client_secret'),
-            scopes=creds_data.get('scopes')
+            scopes=creds_data.get('scopes'),
+            expiry=datetime.fromisoformat(creds_data['expiry']) if creds_data.get('expiry') else None
         )
         
-        # Refresh if expired
+        # Refresh if expired (google-auth treats tokens near expiry as expired)
         if creds.expired and creds.refresh_token:
             creds.refresh(GoogleRequest())
             # Update session
             self._save_credentials(creds)
         
+        g._google_creds = (creds.token, creds)
         return creds
     
     def _save_credentials(self, creds):
@@ -132,7 +141,8 @@ class PenguinCAMAuth:
             'token_uri': creds.token_uri,
             'client_id': creds.client_id,
             'client_secret': creds.client_secret,
-            'scopes': creds.scopes
+            'scopes': creds.scopes,
+            'expiry': creds.expiry.isoformat() if creds.expiry else None
         }
     
     def _create_flow(self):
@@ -143,14 +153,14 @@ class PenguinCAMAuth:
                 "client_secret": self.config['google_client_secret'],
                 "auth_uri": "https://accounts.google.com/o/oauth2/auth",
                 "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": [f"{self.config['base_url']}/auth/callback"]
+                "redirect_uris": [self.config['redirect_uri']]
             }
         }
         
         flow = Flow.from_client_config(
             client_config,
             scopes=self.SCOPES,
-            redirect_uri=f"{self.config['base_url']}/auth/callback"
+            redirect_uri=self.config['redirect_uri']
         )
         
         return flow
@@ -158,16 +168,12 @@ class PenguinCAMAuth:
     def _check_authorization(self, email, domain):
         """Check if user is authorized"""
         # Check specific emails
-        if email in self.config.get('allowed_emails', []):
+        if email in self.config['allowed_emails']:
             return True
         
-        # Check domain
-        if self.config.get('require_domain', True):
-            allowed_domains = self.config.get('allowed_domains', [])
-            if not allowed_domains:
-                return False  # No domains configured = no one allowed
-            
-            return domain in allowed_domains
+        # Check domain (empty set = no one allowed)
+        if self.config['require_domain']:
+            return domain in self.config['allowed_domains']
         
         return True  # If not requiring domain and not in specific list, allow
     
@@ -223,7 +229,7 @@ class PenguinCAMAuth:
                 user_info = user_info_service.userinfo().get().execute()
                 
                 email = user_info.get('email')
-                domain = email.split('@')[1] if '@' in email else None
+                domain = email.split('@', 1)[1] if '@' in email else None
                 
                 # Check authorization
                 if not self._check_authorization(email, domain):
@@ -4,6 +4,7 @@ FRC CAM Post-Processor - SAFE TEST VERSION
 This version adds extra safety features for testing
 """
 
+import re
 import sys
 from pathlib import Path
 
@@ -42,39 +43,34 @@ class SafeTestPostProcessor(FRCPostProcessor):
         with open(output_file, 'r') as f:
             original_gcode = f.readlines()
         
-        # Modify for safety
-        gcode = []
-        for line in original_gcode:
-            # Disable all spindle commands
-            if line.strip().startswith('M3') or line.strip().startswith('M03'):
-                gcode.append("M5  ; SPINDLE DISABLED FOR TEST")
-                continue
-            
-            # Raise all Z heights by safety offset
-            if 'Z' in line and not line.strip().startswith('('):
-                # Parse and modify Z values
-                parts = line.split(';')
-                code_part = parts[0]
-                comment = ';'.join(parts[1:]) if len(parts) > 1 else ''
-                
-                if 'Z' in code_part:
-                    # Simple Z value extraction and modification
-                    import re
-                    z_match = re.search(r'Z(-?\d+\.?\d*)', code_part)
-                    if z_match:
-                        original_z = float(z_match.group(1))
-                        safe_z = original_z + self.safety_height_offset
-                        code_part = re.sub(r'Z-?\d+\.?\d*', f'Z{safe_z:.4f}', code_part)
-                        line = code_part
-                        if comment:
-                            line += ' ; ' + comment
-                        line += f' [SAFE: original Z={original_z:.4f}]'
-            
-            gcode.append(line)
-        
-        # Write modified gcode
+        # Modify for safety, writing each line straight back out
         with open(output_file, 'w') as f:
-            f.writelines(gcode)
+            for line in original_gcode:
+                # Disable all spindle commands
+                if line.strip().startswith('M3') or line.strip().startswith('M03'):
+                    f.write("M5  ; SPINDLE DISABLED FOR TEST")
+                    continue
+                
+                # Raise all Z heights by safety offset
+                if 'Z' in line and not line.strip().startswith('('):
+                    # Parse and modify Z values
+                    parts = line.split(';')
+                    code_part = parts[0]
+                    comment = ';'.join(parts[1:]) if len(parts) > 1 else ''
+                    
+                    if 'Z' in code_part:
+                        # Simple Z value extraction and modification
+                        z_match = re.search(r'Z(-?\d+\.?\d*)', code_part)
+                        if z_match:
+                            original_z = float(z_match.group(1))
+                            safe_z = original_z + self.safety_height_offset
+                            code_part = re.sub(r'Z-?\d+\.?\d*', f'Z{safe_z:.4f}', code_part)
+                            line = code_part
+                            if comment:
+                                line += ' ; ' + comment
+                            line += f' [SAFE: original Z={original_z:.4f}]'
+                
+                f.write(line)
         
         # Generate report
         report_file = output_file.replace('.gcode', '_SAFETY_REPORT.txt')
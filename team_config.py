@@ -6,8 +6,12 @@ stored in Onshape documents. Falls back to Team 6238 defaults if config
 is missing or incomplete.
 """
 
-import yaml
-from typing import Optional, Dict, Any
+import re
+from dataclasses import dataclass, fields
+from collections.abc import Mapping
+from functools import cached_property
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Tuple, Final, NamedTuple
 
 
 # =============================================================================
@@ -15,7 +19,16 @@ from typing import Optional, Dict, Any
 # These are used as fallbacks when config values are missing
 # =============================================================================
 
-TEAM_6238_DEFAULTS = {
+def _freeze(data: Dict[str, Any]) -> Mapping:
+    """Recursively wrap a nested dict in read-only MappingProxyType views"""
+    return MappingProxyType({
+        key: _freeze(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    })
+
+
+# Read-only so no code path can accidentally mutate the shared defaults
+TEAM_6238_DEFAULTS: Final[Mapping[str, Any]] = _freeze({
     'team': {
         'number': 6238,
         'name': 'Popcorn Penguins'
@@ -137,7 +150,131 @@ TEAM_6238_DEFAULTS = {
             'folder_id': None
         }
     }
-}
+})
+
+
+def _flatten(data: Mapping, prefix: Tuple[str, ...] = ()) -> Dict[Tuple[str, ...], Any]:
+    """Map every key path in a nested mapping (including intermediate mappings) to its value"""
+    flat = {}
+    for key, value in data.items():
+        path = prefix + (key,)
+        flat[path] = value
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, path))
+    return flat
+
+
+def _deep_merge(defaults: Mapping, overrides: Mapping) -> Dict[str, Any]:
+    """
+    Merge config overrides over defaults, returning a new dict.
+
+    Nested dicts are merged recursively. None values in overrides, and
+    non-dict overrides of a dict default, fall back to the default.
+
+    Args:
+        defaults: Default values
+        overrides: User config values
+
+    Returns:
+        Merged dict (inputs are not modified)
+    """
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        default = defaults.get(key)
+        if value is None:
+            continue
+        if isinstance(default, Mapping):
+            if isinstance(value, Mapping):
+                merged[key] = _deep_merge(default, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+# Parameters a custom material must define to be considered complete
+_REQUIRED_MATERIAL_PARAMS = frozenset({
+    'name', 'spindle_speed', 'feed_rate', 'ramp_feed_rate', 'plunge_rate',
+    'traverse_rate', 'approach_rate', 'ramp_angle', 'ramp_start_clearance',
+    'stepover_percentage', 'helix_radius_multiplier', 'max_slotting_depth',
+    'tab_width', 'tab_height'
+})
+
+# Folder ID in a Drive URL, ignoring query parameters and trailing slashes
+# Format: https://drive.google.com/drive/folders/FOLDER_ID
+# or: https://drive.google.com/drive/u/0/folders/FOLDER_ID
+_DRIVE_FOLDER_RE = re.compile(r'/folders/([^/?#]+)')
+
+
+def _parse_drive_folder_id(folder_value: Optional[str]) -> Optional[str]:
+    """
+    Reduce a configured Drive folder (ID or full URL) to just the folder ID.
+
+    Args:
+        folder_value: Folder ID or Drive URL from config
+
+    Returns:
+        Folder ID, or None if not configured
+    """
+    if not folder_value:
+        return None
+
+    # If it's a full URL, extract the ID
+    if 'drive.google.com' in folder_value:
+        match = _DRIVE_FOLDER_RE.search(folder_value)
+        if match:
+            return match.group(1)
+
+    # Otherwise assume it's already just the ID
+    return folder_value
+
+
+class TubeFacingParams(NamedTuple):
+    """Tube facing parameters, resolved once per TeamConfig."""
+    depth_margin: float
+    max_roughing_depth: float
+    max_finishing_depth: float
+    roughing_tool_edge_p1: float
+    finishing_tool_edge_p1: float
+    roughing_tool_edge_p2: float
+    finishing_tool_edge_p2: float
+    arc_advance: float
+    arc_radius: float
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTeamConfig:
+    """
+    Immutable snapshot of TeamConfig's scalar settings.
+
+    Returned by TeamConfig.freeze() so callers can read settings as plain
+    slot attributes instead of going through property descriptors.
+    """
+    default_machine_id: str
+    team_number: int
+    team_name: str
+    machine_name: str
+    machine_manufacturer: str
+    machine_controller: str
+    machine_park_x: float
+    machine_park_y: float
+    machine_park_z: float
+    machine_coolant: str
+    machine_x_max: float
+    machine_y_max: float
+    machine_z_max: float
+    sacrifice_board_depth: float
+    clearance_height: float
+    tab_width: float
+    tab_height: float
+    tab_spacing: float
+    tabs_enabled: bool
+    remove_tabs: bool
+    pause_before_perimeter: bool
+    hole_detection_tolerance: float
+    min_millable_hole_multiplier: float
+    default_tool_diameter: float
+    google_drive_enabled: bool
+    google_drive_folder_id: Optional[str]
 
 
 class TeamConfig:
@@ -149,6 +286,12 @@ class TeamConfig:
     missing values.
     """
 
+    # '__dict__' must stay: cached_property stores its values in the instance
+    # dict, so instances still carry one and the slots save no memory. They
+    # only make reads of the fixed internal attributes a little faster.
+    __slots__ = ('_data', '_effective_machine', '_flat', '_machine_flats',
+                 '_material_cache', '_frozen', '__dict__')
+
     def __init__(self, config_data: Optional[Dict[str, Any]] = None):
         """
         Initialize team config from YAML data.
@@ -162,6 +305,20 @@ class TeamConfig:
         # Normalize to v2 structure internally for consistent API
         self._data = self._normalize_to_v2(config_data)
 
+        # Default machine config merged over Team 6238 defaults, flattened for _get().
+        # Keyed by key path tuple, e.g. ('machine', 'park_position', 'x')
+        self._effective_machine = self.get_machine_config(None)
+        self._flat = _flatten(self._merge_with_defaults(self._effective_machine))
+
+        # Same as _flat for non-default machines used by _get_for(), keyed by machine_id
+        self._machine_flats = {}
+
+        # Merged material presets, keyed by (machine_id, material)
+        self._material_cache = {}
+
+        # FrozenTeamConfig built on first freeze()
+        self._frozen = None
+
     def _normalize_to_v2(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert any config version to v2 structure internally.
@@ -180,10 +337,8 @@ class TeamConfig:
         if version == 1:
             # Wrap v1 config as single machine named 'default'
             # Copy all keys except 'version' into the default machine
-            machine_config = {}
-            for key, value in data.items():
-                if key != 'version':
-                    machine_config[key] = value
+            machine_config = data.copy()
+            machine_config.pop('version', None)
 
             # Ensure machine has a name
             if 'name' not in machine_config:
@@ -217,52 +372,63 @@ class TeamConfig:
         Returns:
             Value from config, or from TEAM_6238_DEFAULTS, or provided default
         """
+        return self._get_path(keys, default)
+
+    def _get_path(self, keys, default=None):
+        """
+        Same as _get(), but takes the key path as a tuple.
+
+        Properties pass literal tuples, which the compiler stores as constants,
+        so no tuple is built per call.
+        """
+        # Single lookup in the flattened config; no per-level walk
+        value = self._flat.get(keys)
+        return value if value is not None else default
+
+    def _get_for(self, machine_id: Optional[str], *keys, default=None):
+        """
+        Like _get(), but resolves against a specific machine's config.
+
+        Args:
+            machine_id: Machine ID, or None for default machine
+            *keys: Path to nested value
+            default: Optional override default (otherwise uses TEAM_6238_DEFAULTS)
+
+        Returns:
+            Value from machine config, or from TEAM_6238_DEFAULTS, or provided default
+        """
+        machine_config = self.get_machine_config(machine_id)
+        if machine_config is self._effective_machine:
+            return self._get_path(keys, default)
+
+        flat = self._machine_flats.get(machine_id)
+        if flat is None:
+            flat = self._machine_flats[machine_id] = _flatten(self._merge_with_defaults(machine_config))
+
+        value = flat.get(keys)
+        return value if value is not None else default
+
+    def _merge_with_defaults(self, machine_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge a machine config (plus root-level 'team') over Team 6238 defaults.
+
+        Args:
+            machine_config: Machine configuration dict
+
+        Returns:
+            Complete config dict for that machine
+        """
+        overrides = machine_config
+
         # Special case: 'team' is at root level in v2 configs, not in machine config
-        if keys and keys[0] == 'team':
-            value = self._data
-            for key in keys:
-                if isinstance(value, dict):
-                    value = value.get(key)
-                    if value is None:
-                        break
-                else:
-                    value = None
-                    break
-
-            if value is not None:
-                return value
-
-        # Get the default machine config (handles both v1 wrapped and v2 native)
-        machine_config = self.get_machine_config(None)
-
-        # Try to get from machine config
-        value = machine_config
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-                if value is None:
-                    break
-            else:
-                value = None
-                break
-
-        # If found in machine config, return it
-        if value is not None:
-            return value
-
-        # Fall back to Team 6238 defaults
-        default_value = TEAM_6238_DEFAULTS
-        for key in keys:
-            if isinstance(default_value, dict):
-                default_value = default_value.get(key)
-                if default_value is None:
-                    break
-            else:
-                default_value = None
-                break
-
-        # Return default_value from TEAM_6238_DEFAULTS, or provided default
-        return default_value if default_value is not None else default
+        root_team = self._data.get('team')
+        if isinstance(root_team, dict):
+            machine_team = machine_config.get('team')
+            if isinstance(machine_team, dict):
+                root_team = _deep_merge(machine_team, root_team)
+            overrides = {**machine_config, 'team': root_team}
+
+        return _deep_merge(TEAM_6238_DEFAULTS, overrides)
 
     # ========================================================================
     # Machine Management (v2 Config Support)
@@ -277,7 +443,7 @@ class TeamConfig:
         """
         return self._data.get('machines', {})
 
-    @property
+    @cached_property
     def default_machine_id(self) -> str:
         """Get default machine ID"""
         return self._data.get('default_machine', 'default')
@@ -302,152 +468,157 @@ class TeamConfig:
     # Team Information
     # ========================================================================
 
-    @property
+    @cached_property
     def team_number(self) -> int:
         """FRC team number"""
-        return self._get('team', 'number')
+        return self._get_path(('team', 'number'))
 
-    @property
+    @cached_property
     def team_name(self) -> str:
         """FRC team name"""
-        return self._get('team', 'name')
+        return self._get_path(('team', 'name'))
 
     # ========================================================================
     # Machine Configuration
     # ========================================================================
 
-    @property
+    @cached_property
     def machine_name(self) -> str:
         """Machine model name"""
-        return self._get('machine', 'name')
+        return self._get_path(('machine', 'name'))
 
-    @property
+    @cached_property
     def machine_manufacturer(self) -> str:
         """Machine manufacturer"""
-        return self._get('machine', 'manufacturer')
+        return self._get_path(('machine', 'manufacturer'))
 
-    @property
+    @cached_property
     def machine_controller(self) -> str:
         """Machine controller type (Mach3, Mach4, LinuxCNC, etc.)"""
-        return self._get('machine', 'controller')
+        return self._get_path(('machine', 'controller'))
 
-    @property
+    @cached_property
     def machine_park_x(self) -> float:
         """Machine park X position (machine coordinates)"""
-        return self._get('machine', 'park_position', 'x')
+        return self._get_path(('machine', 'park_position', 'x'))
 
-    @property
+    @cached_property
     def machine_park_y(self) -> float:
         """Machine park Y position (machine coordinates)"""
-        return self._get('machine', 'park_position', 'y')
+        return self._get_path(('machine', 'park_position', 'y'))
 
-    @property
+    @cached_property
     def machine_park_z(self) -> float:
         """Machine park Z position (machine coordinates, safe clearance)"""
-        return self._get('machine', 'park_position', 'z')
+        return self._get_path(('machine', 'park_position', 'z'))
 
-    @property
+    @cached_property
     def machine_coolant(self) -> str:
         """Machine coolant type (Air, Flood, Mist, None)"""
-        return self._get('machine', 'coolant')
+        return self._get_path(('machine', 'coolant'))
 
-    @property
+    @cached_property
     def machine_x_max(self) -> float:
         """Machine maximum X travel (inches)"""
-        return self._get('machine', 'dimensions', 'x_max')
+        return self._get_path(('machine', 'dimensions', 'x_max'))
 
-    @property
+    @cached_property
     def machine_y_max(self) -> float:
         """Machine maximum Y travel (inches)"""
-        return self._get('machine', 'dimensions', 'y_max')
+        return self._get_path(('machine', 'dimensions', 'y_max'))
 
-    @property
+    @cached_property
     def machine_z_max(self) -> float:
         """Machine maximum Z travel (inches)"""
-        return self._get('machine', 'dimensions', 'z_max')
+        return self._get_path(('machine', 'dimensions', 'z_max'))
 
     # ========================================================================
     # General Machining Preferences
     # ========================================================================
 
-    @property
+    @cached_property
     def sacrifice_board_depth(self) -> float:
         """How far to cut into sacrifice board (inches)"""
-        return self._get('machining', 'z_reference', 'sacrifice_board_depth')
+        return self._get_path(('machining', 'z_reference', 'sacrifice_board_depth'))
 
-    @property
+    @cached_property
     def clearance_height(self) -> float:
         """Clearance above material for rapid moves (inches)"""
-        return self._get('machining', 'z_reference', 'clearance_height')
+        return self._get_path(('machining', 'z_reference', 'clearance_height'))
 
-    @property
+    @cached_property
     def tab_width(self) -> float:
         """Default tab width (inches)"""
-        return self._get('machining', 'tabs', 'width')
+        return self._get_path(('machining', 'tabs', 'width'))
 
-    @property
+    @cached_property
     def tab_height(self) -> float:
         """Default tab height (inches)"""
-        return self._get('machining', 'tabs', 'height')
+        return self._get_path(('machining', 'tabs', 'height'))
 
-    @property
+    @cached_property
     def tab_spacing(self) -> float:
         """Default desired tab spacing (inches)"""
-        return self._get('machining', 'tabs', 'spacing')
+        return self._get_path(('machining', 'tabs', 'spacing'))
 
-    @property
+    @cached_property
     def tabs_enabled(self) -> bool:
         """Whether tabs are enabled for perimeter cutting"""
-        return self._get('machining', 'tabs', 'enabled')
+        return self._get_path(('machining', 'tabs', 'enabled'))
 
-    @property
+    @cached_property
     def remove_tabs(self) -> bool:
         """Whether to automatically remove tabs at end of job"""
-        return self._get('machining', 'tabs', 'remove_tabs')
+        return self._get_path(('machining', 'tabs', 'remove_tabs'))
 
-    @property
+    @cached_property
     def pause_before_perimeter(self) -> bool:
         """Whether to pause before cutting perimeter (for screw fixturing)"""
-        return self._get('machining', 'fixturing', 'pause_before_perimeter')
+        return self._get_path(('machining', 'fixturing', 'pause_before_perimeter'))
 
-    @property
+    @cached_property
     def hole_detection_tolerance(self) -> float:
         """Tolerance for detecting circular holes (inches)"""
-        return self._get('machining', 'holes', 'detection_tolerance')
+        return self._get_path(('machining', 'holes', 'detection_tolerance'))
 
-    @property
+    @cached_property
     def min_millable_hole_multiplier(self) -> float:
         """Minimum hole diameter as multiple of tool diameter"""
-        return self._get('machining', 'holes', 'min_millable_multiplier')
+        return self._get_path(('machining', 'holes', 'min_millable_multiplier'))
 
-    @property
+    @cached_property
     def default_tool_diameter(self) -> float:
         """Default tool diameter (inches) - used as UI default"""
-        return self._get('machining', 'default_tool', 'diameter')
+        return self._get_path(('machining', 'default_tool', 'diameter'))
 
     # ========================================================================
     # Tube Facing Parameters
     # ========================================================================
 
+    @cached_property
+    def tube_facing_params(self) -> TubeFacingParams:
+        """All tube facing parameters, with attribute access"""
+        return TubeFacingParams(
+            depth_margin=self._get_path(('tube_facing', 'depth_margin')),
+            max_roughing_depth=self._get_path(('tube_facing', 'max_roughing_depth')),
+            max_finishing_depth=self._get_path(('tube_facing', 'max_finishing_depth')),
+            roughing_tool_edge_p1=self._get_path(('tube_facing', 'phase_1', 'roughing_tool_edge')),
+            finishing_tool_edge_p1=self._get_path(('tube_facing', 'phase_1', 'finishing_tool_edge')),
+            roughing_tool_edge_p2=self._get_path(('tube_facing', 'phase_2', 'roughing_tool_edge')),
+            finishing_tool_edge_p2=self._get_path(('tube_facing', 'phase_2', 'finishing_tool_edge')),
+            arc_advance=self._get_path(('tube_facing', 'arc_advance')),
+            arc_radius=self._get_path(('tube_facing', 'arc_radius'))
+        )
+
     def get_tube_facing_params(self) -> Dict[str, Any]:
-        """Get all tube facing parameters as a dict"""
-        return {
-            'depth_margin': self._get('tube_facing', 'depth_margin'),
-            'max_roughing_depth': self._get('tube_facing', 'max_roughing_depth'),
-            'max_finishing_depth': self._get('tube_facing', 'max_finishing_depth'),
-            'roughing_tool_edge_p1': self._get('tube_facing', 'phase_1', 'roughing_tool_edge'),
-            'finishing_tool_edge_p1': self._get('tube_facing', 'phase_1', 'finishing_tool_edge'),
-            'roughing_tool_edge_p2': self._get('tube_facing', 'phase_2', 'roughing_tool_edge'),
-            'finishing_tool_edge_p2': self._get('tube_facing', 'phase_2', 'finishing_tool_edge'),
-            'arc_advance': self._get('tube_facing', 'arc_advance'),
-            'arc_radius': self._get('tube_facing', 'arc_radius')
-        }
+        """Get all tube facing parameters as a dict (see tube_facing_params)"""
+        return self.tube_facing_params._asdict()
 
     # ========================================================================
     # Material Presets
     # ========================================================================
 
-    def get_available_materials(self, machine_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    def get_available_materials(self, machine_id: Optional[str] = None) -> Dict[str, Mapping[str, Any]]:
         """
         Get all available materials for a specific machine.
 
@@ -457,18 +628,14 @@ class TeamConfig:
         Returns:
             Dictionary mapping material ID to material info (with 'name' and other params)
         """
-        machine_config = self.get_machine_config(machine_id)
+        machine_materials = self.get_machine_config(machine_id).get('materials', {})
 
-        # Start with Team 6238 defaults
-        materials = dict(TEAM_6238_DEFAULTS['materials'])
-
-        # Add/override with machine-specific materials
-        machine_materials = machine_config.get('materials', {})
-        for material_id, material_data in machine_materials.items():
-            # Get complete material preset (with fallback)
-            materials[material_id] = self.get_material_preset(material_id, machine_id)
-
-        return materials
+        # Team 6238 defaults first, then machine-specific additions (in config order).
+        # Each entry is the cached complete preset (with fallback).
+        return {
+            material_id: self.get_material_preset(material_id, machine_id)
+            for material_id in (*TEAM_6238_DEFAULTS['materials'], *machine_materials)
+        }
 
     def is_material_complete(self, material: str, machine_id: Optional[str] = None) -> bool:
         """
@@ -481,14 +648,6 @@ class TeamConfig:
         Returns:
             True if material has all required params, False if using fallback
         """
-        # Required parameters for a complete material definition
-        required_params = {
-            'name', 'spindle_speed', 'feed_rate', 'ramp_feed_rate', 'plunge_rate',
-            'traverse_rate', 'approach_rate', 'ramp_angle', 'ramp_start_clearance',
-            'stepover_percentage', 'helix_radius_multiplier', 'max_slotting_depth',
-            'tab_width', 'tab_height'
-        }
-
         # Check if material exists in defaults
         if material in TEAM_6238_DEFAULTS['materials']:
             return True
@@ -496,9 +655,10 @@ class TeamConfig:
         # Check if machine config has all required parameters
         machine_config = self.get_machine_config(machine_id)
         machine_material = machine_config.get('materials', {}).get(material, {})
-        return required_params.issubset(machine_material.keys())
+        # Custom materials usually override only a few values, so bail on the first missing one
+        return all(param in machine_material for param in _REQUIRED_MATERIAL_PARAMS)
 
-    def get_material_preset(self, material: str, machine_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_material_preset(self, material: str, machine_id: Optional[str] = None) -> Mapping[str, Any]:
         """
         Get material preset parameters for a specific machine with fallback to Team 6238 defaults.
 
@@ -507,8 +667,14 @@ class TeamConfig:
             machine_id: Machine ID, or None for default machine
 
         Returns:
-            Dictionary of material parameters (always complete, uses plywood fallback)
+            Read-only mapping of material parameters (always complete, uses plywood
+            fallback). The mapping is cached and shared between calls.
         """
+        cache_key = (machine_id or self.default_machine_id, material)
+        cached = self._material_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         machine_config = self.get_machine_config(machine_id)
 
         # Get machine-specific material config
@@ -525,45 +691,43 @@ class TeamConfig:
                 machine_material = {**machine_material, 'name': material.replace('_', ' ').title()}
 
         # Merge: defaults → machine overrides
-        return {**default_preset, **machine_material}
+        preset = self._material_cache[cache_key] = MappingProxyType({**default_preset, **machine_material})
+        return preset
 
     # ========================================================================
     # Integration Settings
     # ========================================================================
 
-    @property
+    @cached_property
     def google_drive_enabled(self) -> bool:
         """Whether Google Drive integration is enabled for this team"""
-        return self._get('integrations', 'google_drive', 'enabled')
+        return self._get_path(('integrations', 'google_drive', 'enabled'))
 
-    @property
+    @cached_property
     def google_drive_folder_id(self) -> Optional[str]:
         """
         Google Drive folder ID for uploading G-code.
         Accepts either a folder ID or a full Drive URL, returns just the ID.
         """
-        folder_value = self._get('integrations', 'google_drive', 'folder_id')
-
-        if not folder_value:
-            return None
-
-        # If it's a full URL, extract the ID
-        if 'drive.google.com' in folder_value:
-            # Format: https://drive.google.com/drive/folders/FOLDER_ID
-            # or: https://drive.google.com/drive/u/0/folders/FOLDER_ID
-            parts = folder_value.split('/folders/')
-            if len(parts) == 2:
-                # Remove any query parameters or trailing slashes
-                folder_id = parts[1].split('?')[0].rstrip('/')
-                return folder_id
-
-        # Otherwise assume it's already just the ID
-        return folder_value
+        return _parse_drive_folder_id(self._get_path(('integrations', 'google_drive', 'folder_id')))
 
     # ========================================================================
     # Helpers
     # ========================================================================
 
+    def freeze(self) -> FrozenTeamConfig:
+        """
+        Snapshot all scalar settings into an immutable FrozenTeamConfig.
+
+        Returns:
+            FrozenTeamConfig with every property resolved once
+        """
+        if self._frozen is None:
+            self._frozen = FrozenTeamConfig(
+                **{f.name: getattr(self, f.name) for f in fields(FrozenTeamConfig)}
+            )
+        return self._frozen
+
     def to_dict(self, machine_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Return config as a dictionary for JSON serialization.
@@ -574,44 +738,18 @@ class TeamConfig:
         Returns:
             Dictionary with machine-specific settings
         """
-        machine_config = self.get_machine_config(machine_id)
-
-        # Helper to get machine-specific setting with fallback
-        def get_machine_setting(*keys, default=None):
-            value = machine_config
-            for key in keys:
-                if isinstance(value, dict):
-                    value = value.get(key)
-                    if value is None:
-                        break
-                else:
-                    value = None
-                    break
-            # Fallback to TEAM_6238_DEFAULTS if not in machine config
-            if value is None:
-                fallback = TEAM_6238_DEFAULTS
-                for key in keys:
-                    if isinstance(fallback, dict):
-                        fallback = fallback.get(key)
-                        if fallback is None:
-                            break
-                    else:
-                        fallback = None
-                        break
-                value = fallback if fallback is not None else default
-            return value
-
         return {
             'team_number': self.team_number,
             'team_name': self.team_name,
-            'machine_name': get_machine_setting('machine', 'name'),
-            'machine_controller': get_machine_setting('machine', 'controller'),
-            'machine_x_max': get_machine_setting('machine', 'dimensions', 'x_max'),
-            'machine_y_max': get_machine_setting('machine', 'dimensions', 'y_max'),
-            'machine_z_max': get_machine_setting('machine', 'dimensions', 'z_max'),
-            'google_drive_enabled': get_machine_setting('integrations', 'google_drive', 'enabled'),
-            'google_drive_folder_id': get_machine_setting('integrations', 'google_drive', 'folder_id'),
-            'default_tool_diameter': get_machine_setting('default_tool', 'diameter'),
+            'machine_name': self._get_for(machine_id, 'machine', 'name'),
+            'machine_controller': self._get_for(machine_id, 'machine', 'controller'),
+            'machine_x_max': self._get_for(machine_id, 'machine', 'dimensions', 'x_max'),
+            'machine_y_max': self._get_for(machine_id, 'machine', 'dimensions', 'y_max'),
+            'machine_z_max': self._get_for(machine_id, 'machine', 'dimensions', 'z_max'),
+            'google_drive_enabled': self._get_for(machine_id, 'integrations', 'google_drive', 'enabled'),
+            'google_drive_folder_id': _parse_drive_folder_id(
+                self._get_for(machine_id, 'integrations', 'google_drive', 'folder_id')),
+            'default_tool_diameter': self._get_for(machine_id, 'default_tool', 'diameter'),
         }
 
     @classmethod
@@ -625,13 +763,34 @@ class TeamConfig:
         Returns:
             TeamConfig instance (falls back to Team 6238 defaults on parse error)
         """
+        # Imported here so processes that only use defaults never load PyYAML
+        import yaml
+
+        # Prefer the libyaml-backed loader when PyYAML was built with it
         try:
-            data = yaml.safe_load(yaml_content)
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:
+            from yaml import SafeLoader
+
+        try:
+            data = yaml.load(yaml_content, Loader=SafeLoader)
             return cls(data)
         except yaml.YAMLError as e:
             print(f"⚠️  Error parsing team config YAML: {e}")
             print("   Using Team 6238 defaults")
-            return cls()
+            return cls.default()
+
+    @classmethod
+    def default(cls) -> 'TeamConfig':
+        """
+        Get the shared Team 6238 defaults config.
+
+        Built once at import time; callers must not mutate it.
+
+        Returns:
+            TeamConfig instance with no team overrides
+        """
+        return _DEFAULT_CONFIG
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'TeamConfig':
@@ -650,6 +809,10 @@ class TeamConfig:
         return f"TeamConfig(team={self.team_number}, name='{self.team_name}')"
 
 
+# Shared defaults-only config returned by TeamConfig.default()
+_DEFAULT_CONFIG = TeamConfig()
+
+
 # =============================================================================
 # YAML TEMPLATE
 # =============================================================================
@@ -5,20 +5,39 @@ These functions are used by both unit tests and system tests.
 
 from pygcode import Line, Machine, GCodeLinearMove, GCodeRapidMove, GCodeArcMoveCW, GCodeArcMoveCCW
 
+# Exact-type sets for the scan loops: pygcode instantiates these classes
+# directly, so a set lookup on type() replaces the isinstance() MRO walk.
+_LINEAR_OR_ARC_MOVES = frozenset((GCodeLinearMove, GCodeArcMoveCW, GCodeArcMoveCCW))
+_LINEAR_OR_RAPID_MOVES = frozenset((GCodeLinearMove, GCodeRapidMove))
+
+
+def _is_comment_or_blank(stripped):
+    """True for an empty line, a ';' comment, or a single '( ... )' comment"""
+    if not stripped or stripped[0] == ';':
+        return True
+    return stripped[0] == '(' and stripped.find(')') == len(stripped) - 1
+
 
 def load_gcode_file(gcode_file_path):
-    """Load G-code file and return list of Line objects"""
+    """Load G-code file and return list of Line objects (comments and blanks skipped)"""
     lines = []
+    append = lines.append  # Bound once for the per-line loop
     with open(gcode_file_path, "r") as f:
-        for line_num, line_text in enumerate(f.readlines(), 1):
+        # Stream the file rather than materializing it with readlines()
+        for line_num, line_text in enumerate(f, 1):
+            stripped = line_text.strip()
+            # Filter comment-only lines up front instead of letting them
+            # go through the parser (and its exception path)
+            if _is_comment_or_blank(stripped):
+                continue
             try:
                 line = Line(line_text)
-                lines.append(line)
             except Exception as e:
-                if line_text.strip() and not line_text.strip().startswith(';') and not line_text.strip().startswith('('):
-                    print(f"Warning: Could not parse line {line_num}: {line_text.strip()}")
+                if not stripped.startswith('('):
+                    print(f"Warning: Could not parse line {line_num}: {stripped}")
                     print(f"  Error: {e}")
                 continue
+            append(line)
     return lines
 
 
@@ -34,97 +53,90 @@ def get_machine_state(gcode_lines):
 
 
 def get_feedrates(gcode_lines):
-    """Extract all unique feedrates from G-code"""
-    feedrates = []
+    """Extract all unique feedrates from G-code, in order of first use"""
+    # First F word of each block (None for blocks without one)
+    feedrates = (
+        next((word.value for word in line.block.words if word.letter == "F"), None)
+        for line in gcode_lines
+        if line.block and line.block.words
+    )
 
-    for line in gcode_lines:
-        if line.block and line.block.words:
-            for word in line.block.words:
-                if word.letter == "F":
-                    feedrates.append(word.value)
-                    break
-
-    return feedrates
+    # dict.fromkeys de-duplicates while keeping first-seen order
+    return list(dict.fromkeys(f for f in feedrates if f is not None))
 
 
 def get_gcode_boundary(gcode_lines):
     """Extract the bounding box (min/max X, Y, Z) from G-code"""
-    machine = Machine()
-
-    # Track current position
-    current_pos = {'X': 0.0, 'Y': 0.0, 'Z': 0.0}
-
-    # Track min/max for each axis
-    bounds = {
-        'X': {'min': None, 'max': None},
-        'Y': {'min': None, 'max': None},
-        'Z': {'min': None, 'max': None}
-    }
+    # Collect every X/Y/Z value commanded by a linear or arc move
+    axis_values = {'X': [], 'Y': [], 'Z': []}
 
     for line in gcode_lines:
-        if line.block and line.block.gcodes:
-            machine.process_gcodes(*line.block.gcodes)
-
-            for gcode in line.block.gcodes:
-                # Track linear and arc moves
-                if isinstance(gcode, (GCodeLinearMove, GCodeArcMoveCW, GCodeArcMoveCCW)):
-                    if line.block.words:
-                        # Extract position updates
-                        for word in line.block.words:
-                            if word.letter in ['X', 'Y', 'Z']:
-                                new_val = word.value
-                                current_pos[word.letter] = new_val
-
-                                # Update bounds
-                                if bounds[word.letter]['min'] is None or new_val < bounds[word.letter]['min']:
-                                    bounds[word.letter]['min'] = new_val
-                                if bounds[word.letter]['max'] is None or new_val > bounds[word.letter]['max']:
-                                    bounds[word.letter]['max'] = new_val
-
-    return bounds
+        block = line.block
+        if not block:
+            continue
+        gcodes = block.gcodes
+        words = block.words
+        if not gcodes or not words:
+            continue
+
+        for gcode in gcodes:
+            # Track linear and arc moves
+            if type(gcode) in _LINEAR_OR_ARC_MOVES:
+                for word in words:
+                    values = axis_values.get(word.letter)
+                    if values is not None:
+                        values.append(word.value)
+
+    # Reduce each axis once rather than comparing on every word
+    return {
+        axis: {
+            'min': min(values) if values else None,
+            'max': max(values) if values else None
+        }
+        for axis, values in axis_values.items()
+    }
 
 
 def get_safe_heights(gcode_lines):
     """Extract clearance and retract heights from G-code"""
-    machine = Machine()
-
-    current_z = 0.0
-    retract_heights = []  # Upward Z moves (retracts)
-    clearance_heights = []  # Maximum Z positions reached
-    plunge_starts = []  # Z position before plunging
+    # First pass: Z target and XY flag of every move that sets Z
+    z_moves = []
 
     for line in gcode_lines:
-        if line.block and line.block.gcodes:
-            machine.process_gcodes(*line.block.gcodes)
-
-            for gcode in line.block.gcodes:
-                # Track moves
-                if isinstance(gcode, (GCodeLinearMove, GCodeRapidMove)):
-                    if line.block.words:
-                        has_z = any(w.letter == 'Z' for w in line.block.words)
-                        has_xy = any(w.letter in ['X', 'Y'] for w in line.block.words)
-
-                        if has_z:
-                            # Get new Z value
-                            new_z = current_z
-                            for w in line.block.words:
-                                if w.letter == 'Z':
-                                    new_z = w.value
-                                    break
-
-                            # Detect retracts (upward Z moves without XY)
-                            if new_z > current_z and not has_xy:
-                                retract_heights.append(new_z)
-                                clearance_heights.append(new_z)
-
-                            # Detect plunge start positions (Z before downward move)
-                            elif new_z < current_z and not has_xy:
-                                plunge_starts.append(current_z)
-
-                            current_z = new_z
+        block = line.block
+        if not block:
+            continue
+        gcodes = block.gcodes
+        words = block.words
+        if not gcodes or not words:
+            continue
+
+        # Track moves
+        if any(type(gcode) in _LINEAR_OR_RAPID_MOVES for gcode in gcodes):
+            # Scan the words once for the first Z value and any XY motion
+            new_z = None
+            has_xy = False
+            for word in words:
+                letter = word.letter
+                if letter == 'Z':
+                    if new_z is None:
+                        new_z = word.value
+                elif letter == 'X' or letter == 'Y':
+                    has_xy = True
+
+            if new_z is not None:
+                z_moves.append((new_z, has_xy))
+
+    # Second pass: compare each Z-only move with the Z before it (starts at 0)
+    prev_zs = [0.0] + [z for z, _ in z_moves[:-1]]
+    transitions = [(prev_z, z) for prev_z, (z, has_xy) in zip(prev_zs, z_moves) if not has_xy]
+
+    # Retracts are upward Z moves; plunges start from the Z before a downward move
+    retract_heights = [z for prev_z, z in transitions if z > prev_z]
+    plunge_starts = [prev_z for prev_z, z in transitions if z < prev_z]
 
     return {
         'retract_heights': sorted(set(retract_heights)),
-        'max_clearance': max(clearance_heights) if clearance_heights else None,
+        'max_clearance': max(retract_heights) if retract_heights else None,
         'plunge_start_heights': sorted(set(plunge_starts))
     }
@@ -3,7 +3,10 @@ import unittest
 import tempfile
 import os
 import re
-from frc_cam_postprocessor import FRCPostProcessor
+from frc_cam_postprocessor import FRCPostProcessor, _tube_facing_toolpath
+
+# Y word in a G-code line, compiled once for the per-line scans below
+_Y_EXTRACT = re.compile(r'Y(-?\d+\.?\d*)')
 
 
 class TestYCoordinateAdjustment(unittest.TestCase):
@@ -64,6 +67,14 @@ class TestYCoordinateAdjustment(unittest.TestCase):
 class TestTubeFacingGeneration(unittest.TestCase):
     """Test the generate_tube_facing_gcode method."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Generate the 1x1 program once in memory; the content checks below share it."""
+        pp = FRCPostProcessor(0.25, 0.157)
+        pp.apply_material_preset('aluminum')
+        cls.content = pp.generate_tube_facing_gcode(tube_size='1x1').gcode
+        cls.lines = cls.content.splitlines(keepends=True)
+
     def setUp(self):
         self.pp = FRCPostProcessor(0.25, 0.157)
         self.pp.apply_material_preset('aluminum')
@@ -90,207 +101,137 @@ class TestTubeFacingGeneration(unittest.TestCase):
 
     def test_contains_two_phases(self):
         """Test output contains both phases with pause."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("PHASE 1", content)
-            self.assertIn("PHASE 2", content)
-            self.assertIn("M0", content)  # Pause for flip
-        finally:
-            os.unlink(output_path)
+        self.assertIn("PHASE 1", self.content)
+        self.assertIn("PHASE 2", self.content)
+        self.assertIn("M0", self.content)  # Pause for flip
 
     def test_uses_g55_not_g52(self):
         """Test output uses G55 and doesn't contain G52."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("G55", content)
-            self.assertNotIn("G52", content)
-        finally:
-            os.unlink(output_path)
+        self.assertIn("G55", self.content)
+        self.assertNotIn("G52", self.content)
 
     def test_contains_setup_instructions(self):
         """Test output contains setup instructions in header."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("SETUP INSTRUCTIONS", content)
-            self.assertIn("Mount tube in jig", content)
-            self.assertIn("Z=0 is at bottom of tube", content)
-        finally:
-            os.unlink(output_path)
+        self.assertIn("SETUP INSTRUCTIONS", self.content)
+        self.assertIn("Mount tube in jig", self.content)
+        self.assertIn("Z=0 is at bottom of tube", self.content)
 
     def test_contains_flip_instructions(self):
         """Test output contains flip instructions."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("Flip tube 180 degrees", content)
-            self.assertIn("OPERATOR ACTION REQUIRED", content)
-        finally:
-            os.unlink(output_path)
+        self.assertIn("Flip tube 180 degrees", self.content)
+        self.assertIn("OPERATOR ACTION REQUIRED", self.content)
 
     def test_ends_with_m30(self):
         """Test output ends with program end."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("M30", content)
-        finally:
-            os.unlink(output_path)
+        self.assertIn("M30", self.content)
 
     def test_y_coordinates_differ_between_phases(self):
         """Test that Y coordinates are shifted differently in each phase."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                lines = f.readlines()
-
-            # Find where phases start
-            phase1_start = None
-            phase2_start = None
-            for i, line in enumerate(lines):
-                if "PHASE 1" in line:
-                    phase1_start = i
-                elif "PHASE 2" in line:
-                    phase2_start = i
-
-            self.assertIsNotNone(phase1_start)
-            self.assertIsNotNone(phase2_start)
-
-            # Get first toolpath Y coordinate from each phase
-            # Skip "G0 X0 Y0" origin moves - look for Y coords that aren't Y0
-            phase1_y = None
-            phase2_y = None
-
-            for line in lines[phase1_start:phase2_start]:
-                if 'Y' in line and ('G0' in line or 'G1' in line):
-                    match = re.search(r'Y(-?\d+\.?\d*)', line)
-                    if match:
-                        y_val = float(match.group(1))
-                        # Skip the "G0 X0 Y0" origin positioning
-                        if abs(y_val) > 0.01:
-                            phase1_y = y_val
-                            break
-
-            for line in lines[phase2_start:]:
-                if 'Y' in line and ('G0' in line or 'G1' in line):
-                    match = re.search(r'Y(-?\d+\.?\d*)', line)
-                    if match:
-                        y_val = float(match.group(1))
-                        # Skip the "G0 X0 Y0" origin positioning
-                        if abs(y_val) > 0.01:
-                            phase2_y = y_val
-                            break
-
-            # Y values should be different (different offsets applied)
-            self.assertIsNotNone(phase1_y, "Could not find Y coordinate in Phase 1")
-            self.assertIsNotNone(phase2_y, "Could not find Y coordinate in Phase 2")
-            self.assertNotAlmostEqual(phase1_y, phase2_y, places=2,
-                msg=f"Phase 1 Y ({phase1_y}) should differ from Phase 2 Y ({phase2_y})")
-
-        finally:
-            os.unlink(output_path)
+        lines = self.lines
+
+        # Find where phases start
+        phase1_start = None
+        phase2_start = None
+        for i, line in enumerate(lines):
+            if "PHASE 1" in line:
+                phase1_start = i
+            elif "PHASE 2" in line:
+                phase2_start = i
+
+        self.assertIsNotNone(phase1_start)
+        self.assertIsNotNone(phase2_start)
+
+        # Get first toolpath Y coordinate from each phase
+        # Skip "G0 X0 Y0" origin moves - look for Y coords that aren't Y0
+        phase1_y = None
+        phase2_y = None
+
+        for line in lines[phase1_start:phase2_start]:
+            if 'Y' in line and ('G0' in line or 'G1' in line):
+                match = _Y_EXTRACT.search(line)
+                if match:
+                    y_val = float(match.group(1))
+                    # Skip the "G0 X0 Y0" origin positioning
+                    if abs(y_val) > 0.01:
+                        phase1_y = y_val
+                        break
+
+        for line in lines[phase2_start:]:
+            if 'Y' in line and ('G0' in line or 'G1' in line):
+                match = _Y_EXTRACT.search(line)
+                if match:
+                    y_val = float(match.group(1))
+                    # Skip the "G0 X0 Y0" origin positioning
+                    if abs(y_val) > 0.01:
+                        phase2_y = y_val
+                        break
+
+        # Y values should be different (different offsets applied)
+        self.assertIsNotNone(phase1_y, "Could not find Y coordinate in Phase 1")
+        self.assertIsNotNone(phase2_y, "Could not find Y coordinate in Phase 2")
+        self.assertNotAlmostEqual(phase1_y, phase2_y, places=2,
+            msg=f"Phase 1 Y ({phase1_y}) should differ from Phase 2 Y ({phase2_y})")
 
     def test_contains_straight_facing_passes(self):
         """Test that straight facing passes are generated (G1 cuts across tube)."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            # Should have G1 linear moves for cutting
-            self.assertIn("G1 X", content)
-            # Should have roughing and finishing sections
-            self.assertIn("ROUGHING", content)
-            self.assertIn("FINISHING", content)
-            # Should have default G17 (XY plane) in header
-            self.assertIn("G17", content)
-        finally:
-            os.unlink(output_path)
+        # Should have G1 linear moves for cutting
+        self.assertIn("G1 X", self.content)
+        # Should have roughing and finishing sections
+        self.assertIn("ROUGHING", self.content)
+        self.assertIn("FINISHING", self.content)
+        # Should have default G17 (XY plane) in header
+        self.assertIn("G17", self.content)
 
     def test_contains_safe_z_clearance(self):
         """Test output contains safe Z clearance moves using machine coordinates."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            # Should use G53 G0 Z with park_z value (default -0.5) for safe clearance
-            self.assertIn("G53 G0 Z", content)
-            # Should not use G28 (removed to avoid soft limit issues on some machines)
-            self.assertNotIn("G28", content)
-        finally:
-            os.unlink(output_path)
+        # Should use G53 G0 Z with park_z value (default -0.5) for safe clearance
+        self.assertIn("G53 G0 Z", self.content)
+        # Should not use G28 (removed to avoid soft limit issues on some machines)
+        self.assertNotIn("G28", self.content)
 
     def test_contains_xy_origin_moves(self):
         """Test output contains XY origin rapid moves."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("G0 X0 Y0", content)
-        finally:
-            os.unlink(output_path)
+        self.assertIn("G0 X0 Y0", self.content)
 
     def test_uses_machine_coords_for_parking(self):
         """Test parking uses machine coordinates (G53)."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                content = f.read()
-            self.assertIn("G53 G0 X0.5 Y0.5", content)  # Default generic parking position
-            self.assertNotIn("G0 X0 Y-2.0", content)  # Old work coord parking
-        finally:
-            os.unlink(output_path)
+        self.assertIn("G53 G0 X0.5 Y0.5", self.content)  # Default generic parking position
+        self.assertNotIn("G0 X0 Y-2.0", self.content)  # Old work coord parking
 
     def test_z_before_xy_pattern(self):
         """Test that G53 G0 Z0 always comes before XY moves."""
-        with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as f:
-            output_path = f.name
-        try:
-            self._generate_tube_gcode_to_file(output_path, '1x1')
-            with open(output_path) as f:
-                lines = f.readlines()
-
-            # Find all G53 G0 Z0 lines and verify next XY move follows
-            for i, line in enumerate(lines):
-                if "G53 G0 Z0" in line:
-                    # Look for next non-empty, non-comment line
-                    for j in range(i+1, min(i+5, len(lines))):
-                        next_line = lines[j].strip()
-                        if next_line and not next_line.startswith('('):
-                            # Should be an XY move (G0 X... or G53 G0 X...)
-                            self.assertTrue(
-                                'X' in next_line or 'Y' in next_line or next_line == '',
-                                f"After G53 G0 Z0 at line {i}, expected XY move but got: {next_line}"
-                            )
-                            break
-        finally:
-            os.unlink(output_path)
+        lines = self.lines
+
+        # Find all G53 G0 Z0 lines and verify next XY move follows
+        for i, line in enumerate(lines):
+            if "G53 G0 Z0" in line:
+                # Look for next non-empty, non-comment line
+                for j in range(i+1, min(i+5, len(lines))):
+                    next_line = lines[j].strip()
+                    if next_line and not next_line.startswith('('):
+                        # Should be an XY move (G0 X... or G53 G0 X...)
+                        self.assertTrue(
+                            'X' in next_line or 'Y' in next_line or next_line == '',
+                            f"After G53 G0 Z0 at line {i}, expected XY move but got: {next_line}"
+                        )
+                        break
+
+    def test_repeat_generation_reuses_toolpath(self):
+        """Test that repeat jobs match and a changed feed rate is not served from cache."""
+        first = self.pp.generate_tube_facing_gcode('1x1', timestamp='2026-01-01 00:00:00')
+        before = _tube_facing_toolpath.cache_info()
+        second = self.pp.generate_tube_facing_gcode('1x1', timestamp='2026-01-01 00:00:00')
+        after = _tube_facing_toolpath.cache_info()
+        self.assertEqual(first.gcode, second.gcode)
+        # Both phases come straight from the cache on the repeat job
+        self.assertEqual(after.hits - before.hits, 2)
+        self.assertEqual(after.misses, before.misses)
+
+        self.pp.feed_rate = 12.5
+        third = self.pp.generate_tube_facing_gcode('1x1', timestamp='2026-01-01 00:00:00')
+        self.assertGreater(_tube_facing_toolpath.cache_info().misses, after.misses)
+        self.assertIn("F12.5", third.gcode)
+        self.assertNotEqual(first.gcode, third.gcode)
 
 
 class TestTubeFacingToolEdgePositions(unittest.TestCase):
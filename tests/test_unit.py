@@ -4,27 +4,42 @@ Focus on higher-level functions; minimal tests for low-level utilities.
 """
 
 import unittest
-import math
 import sys
 import os
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from frc_cam_postprocessor import FRCPostProcessor, MATERIAL_PRESETS
+from frc_cam_postprocessor import FRCPostProcessor, MATERIAL_PRESETS, _solve_tour, _offset_contour
 from team_config import TeamConfig
 
+# Unit-circle samples shared by the circular pocket tests (32 evenly spaced angles)
+_ANGLES = np.linspace(0, 2 * np.pi, 32, endpoint=False)
+_COS = np.cos(_ANGLES)
+_SIN = np.sin(_ANGLES)
+
+
+def _ellipse_points(x_radius, y_radius):
+    """Return 32 (x, y) tuples on an origin-centered ellipse"""
+    return list(zip((x_radius * _COS).tolist(), (y_radius * _SIN).tolist()))
+
 
 class TestLowLevelUtilities(unittest.TestCase):
     """Minimal tests for low-level utilities - just verify they work"""
 
+    @classmethod
+    def setUpClass(cls):
+        # These helpers don't touch instance state, so one post-processor serves every test
+        cls.pp = FRCPostProcessor(0.25, 0.157)
+
     def test_distance_2d_basic(self):
-        pp = FRCPostProcessor(0.25, 0.157)
-        self.assertEqual(pp._distance_2d((0, 0), (3, 4)), 5.0)
+        self.assertEqual(self.pp._distance_2d((0, 0), (3, 4)), 5.0)
+        self.assertEqual(self.pp._distance_2d_sq((0, 0), (3, 4)), 25.0)
 
     def test_format_time_basic(self):
-        pp = FRCPostProcessor(0.25, 0.157)
-        self.assertEqual(pp._format_time(125), "2m 5s")
+        self.assertEqual(self.pp._format_time(125), "2m 5s")
 
 
 class TestMaterialPresets(unittest.TestCase):
@@ -69,13 +84,15 @@ class TestMaterialPresets(unittest.TestCase):
 class TestHelicalPassCalculation(unittest.TestCase):
     """Test helical pass calculations for safe ramp angles"""
 
-    def setUp(self):
-        self.pp = FRCPostProcessor(0.25, 0.157)
-        self.pp.apply_material_preset('plywood')
+    @classmethod
+    def setUpClass(cls):
+        # _calculate_helical_passes only reads these settings, so the tests share one instance
+        cls.pp = FRCPostProcessor(0.25, 0.157)
+        cls.pp.apply_material_preset('plywood')
         # Set known values for predictable results
-        self.pp.material_top = 0.25
-        self.pp.cut_depth = -0.02
-        self.pp.ramp_start_clearance = 0.15
+        cls.pp.material_top = 0.25
+        cls.pp.cut_depth = -0.02
+        cls.pp.ramp_start_clearance = 0.15
 
     def test_returns_tuple_of_passes_and_depth(self):
         result = self.pp._calculate_helical_passes(0.1)
@@ -179,6 +196,20 @@ class TestHoleSorting(unittest.TestCase):
         # Optimized route should be at most as long as naive route
         self.assertLessEqual(optimized_dist, naive_dist)
 
+    def test_solve_tour_returns_visit_order(self):
+        """Test the coordinate-only tour kernel behind the route optimizer"""
+        centers = [(5, 5), (1, 3), (1, 1), (3, 2)]
+        tour, total_dist, iterations = _solve_tour(centers)
+
+        self.assertEqual(sorted(tour), [0, 1, 2, 3])
+        self.assertEqual(tour[0], 2)  # (1, 1) is closest to origin
+        self.assertGreaterEqual(iterations, 1)
+
+        expected = self.pp._distance_2d((0, 0), centers[tour[0]])
+        for a, b in zip(tour, tour[1:]):
+            expected += self.pp._distance_2d(centers[a], centers[b])
+        self.assertEqual(total_dist, expected)
+
     def test_single_hole_not_affected(self):
         self.pp.circles = [
             {'center': (5, 5), 'radius': 0.25, 'diameter': 0.5},
@@ -191,19 +222,14 @@ class TestHoleSorting(unittest.TestCase):
 class TestPocketCircularDetection(unittest.TestCase):
     """Test circular pocket detection"""
 
-    def setUp(self):
-        self.pp = FRCPostProcessor(0.25, 0.157)
+    @classmethod
+    def setUpClass(cls):
+        # _is_pocket_circular is a pure check on the points passed in
+        cls.pp = FRCPostProcessor(0.25, 0.157)
 
     def test_circle_is_detected_as_circular(self):
         # Generate points on a circle
-        num_points = 32
-        radius = 1.0
-        circle_points = []
-        for i in range(num_points):
-            angle = 2 * math.pi * i / num_points
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            circle_points.append((x, y))
+        circle_points = _ellipse_points(1.0, 1.0)
 
         self.assertTrue(self.pp._is_pocket_circular(circle_points))
 
@@ -219,18 +245,17 @@ class TestPocketCircularDetection(unittest.TestCase):
         self.assertFalse(self.pp._is_pocket_circular(l_shape))
 
     def test_oval_with_tight_tolerance_is_not_circular(self):
-        # Oval: different x and y radii
-        num_points = 32
-        oval_points = []
-        for i in range(num_points):
-            angle = 2 * math.pi * i / num_points
-            x = 2.0 * math.cos(angle)  # x radius = 2
-            y = 1.0 * math.sin(angle)  # y radius = 1
-            oval_points.append((x, y))
+        # Oval: different x and y radii (x radius = 2, y radius = 1)
+        oval_points = _ellipse_points(2.0, 1.0)
 
         # With default 10% tolerance, an oval with 2:1 ratio should not be circular
         self.assertFalse(self.pp._is_pocket_circular(oval_points))
 
+    def test_degenerate_point_lists_are_not_circular(self):
+        # Too few vertices to form a pocket outline
+        self.assertFalse(self.pp._is_pocket_circular([]))
+        self.assertFalse(self.pp._is_pocket_circular([(0, 0), (1, 1)]))
+
 
 class TestPerimeterAndPocketIdentification(unittest.TestCase):
     """Test identification of perimeter and pockets"""
@@ -462,6 +487,15 @@ class TestGCodeFormatting(unittest.TestCase):
                         f"{line.strip()}"
                     )
 
+    def test_regeneration_reuses_contour_offset(self):
+        """Test that regenerating the same part matches and reuses the perimeter offset."""
+        first = self.pp.generate_gcode(timestamp='2026-01-01 00:00:00')
+        hits_before = _offset_contour.cache_info().hits
+        second = self.pp.generate_gcode(timestamp='2026-01-01 00:00:00')
+
+        self.assertEqual(first.gcode, second.gcode)
+        self.assertGreater(_offset_contour.cache_info().hits, hits_before)
+
 
 class TestTeamConfigIntegration(unittest.TestCase):
     """Test that team config values are properly applied to generated G-code."""
@@ -690,6 +724,36 @@ class TestTeamConfigIntegration(unittest.TestCase):
                           "G-code should differ when using different ramp angles")
 
 
+class TestTeamConfigCaching(unittest.TestCase):
+    """Test that team config lookups are cached correctly."""
+
+    def test_material_preset_cached_per_machine(self):
+        """Test that merged presets are reused per (machine, material)."""
+        config = TeamConfig({
+            'version': 2,
+            'default_machine': 'router',
+            'machines': {
+                'router': {'materials': {'plywood': {'feed_rate': 90.0}}},
+                'mill': {'materials': {'plywood': {'feed_rate': 40.0}}},
+            }
+        })
+
+        self.assertIs(config.get_material_preset('plywood'),
+                      config.get_material_preset('plywood', 'router'))
+        self.assertEqual(config.get_material_preset('plywood')['feed_rate'], 90.0)
+        self.assertEqual(config.get_material_preset('plywood', 'mill')['feed_rate'], 40.0)
+        with self.assertRaises(TypeError):
+            config.get_material_preset('plywood')['feed_rate'] = 1.0
+
+    def test_tube_facing_params_resolved_once(self):
+        """Test that tube facing params are cached and match the dict form."""
+        config = TeamConfig({'tube_facing': {'arc_radius': 0.1}})
+
+        self.assertIs(config.tube_facing_params, config.tube_facing_params)
+        self.assertEqual(config.tube_facing_params.arc_radius, 0.1)
+        self.assertEqual(config.get_tube_facing_params(), config.tube_facing_params._asdict())
+
+
 class TestCircularPerimeter(unittest.TestCase):
     """Test parts with circular perimeters (like washers)"""
 
@@ -697,11 +761,7 @@ class TestCircularPerimeter(unittest.TestCase):
         """Test washer-like part: circular perimeter with hole, verify proper rotation and translation."""
         # Disable pocket contouring for this test (we want to test normal hole clearing)
         from team_config import TeamConfig
-        config = TeamConfig()
-        config._data['machines'] = config._data.get('machines', {})
-        config._data['machines']['default'] = config._data['machines'].get('default', {})
-        config._data['machines']['default']['machining'] = config._data['machines']['default'].get('machining', {})
-        config._data['machines']['default']['machining']['pockets'] = {'contour_threshold': 0}
+        config = TeamConfig({'machining': {'pockets': {'contour_threshold': 0}}})
 
         pp = FRCPostProcessor(0.236, 0.157, config=config)
         pp.apply_material_preset('plywood')  # Sets required material parameters
@@ -995,11 +1055,7 @@ class TestPocketContouring(unittest.TestCase):
     def test_contouring_can_be_disabled(self):
         """Test that setting contour_threshold to 0 disables all contouring"""
         from team_config import TeamConfig
-        config = TeamConfig()
-        config._data['machines'] = config._data.get('machines', {})
-        config._data['machines']['default'] = config._data['machines'].get('default', {})
-        config._data['machines']['default']['machining'] = config._data['machines']['default'].get('machining', {})
-        config._data['machines']['default']['machining']['pockets'] = {'contour_threshold': 0}
+        config = TeamConfig({'machining': {'pockets': {'contour_threshold': 0}}})
 
         pp = FRCPostProcessor(0.25, 0.157, config=config)
         pp.apply_material_preset('plywood')